@@ -2,18 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import time
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
 from fastapi import FastAPI, File, HTTPException, UploadFile
 from fastapi.responses import JSONResponse, Response
 from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
 
-from cats_dogs.predict import ModelLoadError, PredictionResult, load_model_bundle, predict_bytes
+from cats_dogs.model import warmup_featurizer
+from cats_dogs.predict import (
+    ModelLoadError,
+    classify_batch_top1,
+    featurize_bytes,
+    load_model_bundle,
+)
 
 APP_NAME = "cats-dogs-api"
 MODEL_PATH = Path(os.getenv("MODEL_PATH", "artifacts/model/model.pkl"))
+BATCH_SIZE = int(os.getenv("PREDICT_BATCH_SIZE", "32"))
+MAX_DELAY_MS = float(os.getenv("PREDICT_MAX_DELAY_MS", "5"))
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+METRICS_CACHE_TTL_SECONDS = 1.0
 
 REQUEST_COUNT = Counter(
     "http_requests_total",
@@ -28,8 +42,22 @@ REQUEST_LATENCY = Histogram(
 
 app = FastAPI(title="Cats vs Dogs Classifier", version="0.1.0")
 
+_METRICS_CACHE = {"ts": float("-inf"), "body": b""}
+
 MODEL_BUNDLE = None
 MODEL_LOAD_ERROR: str | None = None
+PREDICT_QUEUE: asyncio.Queue | None = None
+_BATCH_WORKER: asyncio.Task | None = None
+
+
+@lru_cache(maxsize=256)
+def _request_counter(method: str, endpoint: str, status: str):
+    return REQUEST_COUNT.labels(method, endpoint, status)
+
+
+@lru_cache(maxsize=256)
+def _request_latency(method: str, endpoint: str):
+    return REQUEST_LATENCY.labels(method, endpoint)
 
 
 @app.middleware("http")
@@ -42,8 +70,8 @@ async def record_metrics(request, call_next):
         return response
     finally:
         endpoint = request.url.path
-        REQUEST_COUNT.labels(request.method, endpoint, str(status_code)).inc()
-        REQUEST_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - start_time)
+        _request_counter(request.method, endpoint, str(status_code)).inc()
+        _request_latency(request.method, endpoint).observe(time.perf_counter() - start_time)
 
 
 @app.on_event("startup")
@@ -51,12 +79,89 @@ def load_model() -> None:
     global MODEL_BUNDLE, MODEL_LOAD_ERROR
     try:
         MODEL_BUNDLE = load_model_bundle(MODEL_PATH)
+        warmup_featurizer(MODEL_BUNDLE.feature_config)
         MODEL_LOAD_ERROR = None
     except (ModelLoadError, Exception) as exc:
         MODEL_BUNDLE = None
         MODEL_LOAD_ERROR = str(exc)
 
 
+async def _run_batch_worker(queue: asyncio.Queue) -> None:
+    """Coalesce queued feature vectors into a single classifier call per batch."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + MAX_DELAY_MS / 1000.0
+        while len(batch) < BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        pending = [(features, future) for features, future in batch if not future.done()]
+        if not pending:
+            continue
+        try:
+            results = classify_batch_top1(
+                MODEL_BUNDLE, np.stack([features for features, _ in pending])
+            )
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            continue
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+@app.on_event("startup")
+async def start_batch_worker() -> None:
+    global PREDICT_QUEUE, _BATCH_WORKER
+    PREDICT_QUEUE = asyncio.Queue()
+    _BATCH_WORKER = asyncio.create_task(_run_batch_worker(PREDICT_QUEUE))
+
+
+@app.on_event("shutdown")
+async def stop_batch_worker() -> None:
+    global PREDICT_QUEUE, _BATCH_WORKER
+    if _BATCH_WORKER is not None:
+        _BATCH_WORKER.cancel()
+        try:
+            await _BATCH_WORKER
+        except asyncio.CancelledError:
+            pass
+    PREDICT_QUEUE = None
+    _BATCH_WORKER = None
+
+
+async def _classify(features: np.ndarray) -> tuple[str, float]:
+    if PREDICT_QUEUE is None:
+        return classify_batch_top1(MODEL_BUNDLE, features.reshape(1, -1))[0]
+    future = asyncio.get_running_loop().create_future()
+    await PREDICT_QUEUE.put((features, future))
+    return await future
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """Read an upload in chunks, rejecting it with 413 once it exceeds MAX_UPLOAD_BYTES.
+
+    Starlette has already spooled the whole multipart body (to disk past 1 MB) before
+    this runs, so the cap bounds the in-memory copy, not what the server accepts.
+    """
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large.")
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        buffer.extend(chunk)
+        if len(buffer) > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="File too large.")
+    return bytes(buffer)
+
+
 def _require_model() -> None:
     if MODEL_BUNDLE is None:
         message = MODEL_LOAD_ERROR or "Model not loaded."
@@ -92,15 +197,19 @@ async def predict(file: UploadFile = File(...)) -> dict[str, float | str]:
     _require_model()
     if file.content_type and not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image.")
-    payload = await file.read()
+    payload = await _read_upload(file)
     try:
-        result: PredictionResult = predict_bytes(MODEL_BUNDLE, payload)
+        features = await asyncio.to_thread(featurize_bytes, MODEL_BUNDLE, payload)
+        label, probability = await _classify(features)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Invalid image payload: {exc}") from exc
-    return {"label": result.label, "probability": result.probability}
+    return {"label": label, "probability": probability}
 
 
 @app.get("/metrics")
 def metrics() -> Response:
-    data = generate_latest()
-    return Response(content=data, media_type=CONTENT_TYPE_LATEST)
+    now = time.monotonic()
+    if now - _METRICS_CACHE["ts"] >= METRICS_CACHE_TTL_SECONDS:
+        _METRICS_CACHE["body"] = generate_latest()
+        _METRICS_CACHE["ts"] = now
+    return Response(content=_METRICS_CACHE["body"], media_type=CONTENT_TYPE_LATEST)
@@ -24,6 +24,6 @@ echo "==> Installing dependencies"
 # shellcheck disable=SC1091
 source "$VENV_DIR/bin/activate"
 python -m pip install --upgrade pip
-python -m pip install -r requirements.txt
+python -m pip install -r requirements-train.txt
 
 echo "==> Done"
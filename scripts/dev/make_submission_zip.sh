@@ -36,6 +36,7 @@ INCLUDE_PATHS=(
   argocd
   monitoring
   requirements.txt
+  requirements-train.txt
   README.md
   state.md
   data/splits
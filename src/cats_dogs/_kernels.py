@@ -0,0 +1,46 @@
+"""Optional Numba kernels for the color-histogram feature pipeline.
+
+Numba adds roughly 100 MB of resident memory to a process, so it is only imported
+(via ``cats_dogs._numba_kernels``) the first time a kernel runs. Importing this module,
+or ``cats_dogs.model``, stays cheap for processes that never featurize.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+
+import numpy as np
+
+# Optional: the NumPy featurizer in cats_dogs.model is used when Numba is missing.
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+
+def _bin_shift(bins: int) -> int:
+    """Right shift that maps uint8 pixels to bins, or -1 when bins is not a power of two."""
+    if 0 < bins <= 256 and bins & (bins - 1) == 0:
+        return 8 - (bins.bit_length() - 1)
+    return -1
+
+
+def color_histogram_uint8(image_array: np.ndarray, bins: int) -> np.ndarray:
+    """Fused uint8 histogram kernel; callers must check ``NUMBA_AVAILABLE`` first."""
+    from cats_dogs import _numba_kernels
+
+    return _numba_kernels.histogram_uint8(image_array, bins, _bin_shift(bins))
+
+
+def color_histogram_batch_uint8(
+    images: np.ndarray, out: np.ndarray, bins: int, threads: int | None = None
+) -> None:
+    """Batched (N, H, W, 3) variant writing into ``out``; callers must check ``NUMBA_AVAILABLE``."""
+    from cats_dogs import _numba_kernels
+
+    if threads is not None:
+        _numba_kernels.set_num_threads(threads)
+    _numba_kernels.histogram_batch_uint8(images, out, bins, _bin_shift(bins))
+
+
+def warmup(bins: int) -> None:
+    """Trigger JIT compilation (or a cache load) so the first real call is not cold."""
+    if NUMBA_AVAILABLE:
+        color_histogram_uint8(np.zeros((2, 2, 3), dtype=np.uint8), bins)
@@ -0,0 +1,44 @@
+"""Numba JIT kernels behind ``cats_dogs._kernels``; importing this module loads Numba."""
+
+from __future__ import annotations
+
+import numba
+import numpy as np
+
+
+# Serial on purpose: the API calls this from several request threads at once, and
+# a parallel kernel launched from worker threads can hang Numba's TBB/workqueue
+# thread pools at shutdown. Request-level concurrency supplies the parallelism.
+@numba.njit(fastmath=True, cache=True, nogil=True)
+def histogram_uint8(image: np.ndarray, bins: int, shift: int) -> np.ndarray:
+    height, width, _ = image.shape
+    counts = np.zeros((3, bins), dtype=np.int64)
+    for i in range(height):
+        for j in range(width):
+            for c in range(3):
+                value = np.int64(image[i, j, c])
+                if shift >= 0:
+                    idx = value >> shift
+                else:
+                    idx = min(value * bins // 255, bins - 1)
+                counts[c, idx] += 1
+
+    features = np.zeros(3 * bins, dtype=np.float32)
+    for c in range(3):
+        total = counts[c].sum()
+        if total > 0:
+            for b in range(bins):
+                features[c * bins + b] = counts[c, b] / total
+    return features
+
+
+# Training calls this from one thread per process, so parallelism over the batch is
+# safe here (unlike the request-path kernel above).
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def histogram_batch_uint8(images: np.ndarray, out: np.ndarray, bins: int, shift: int) -> None:
+    for n in numba.prange(images.shape[0]):
+        out[n] = histogram_uint8(images[n], bins, shift)
+
+
+def set_num_threads(threads: int) -> None:
+    numba.set_num_threads(max(1, min(threads, numba.config.NUMBA_NUM_THREADS)))
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
-import random
+import os
+import re
 import zipfile
 from pathlib import Path
 from typing import Iterable
@@ -14,23 +16,73 @@ from PIL import Image
 
 DEFAULT_SEED = 1337
 DEFAULT_IMAGE_SIZE = (224, 224)
+# JPEGs are decoded at a 1/2, 1/4 or 1/8 DCT scale that stays >= this multiple of the
+# target size. Training, evaluation and serving share it so they see the same pixels.
+JPEG_DRAFT_SCALE = 2
 DEFAULT_SPLIT_RATIOS = {"train": 0.8, "val": 0.1, "test": 0.1}
 SUPPORTED_SUFFIXES = {".jpg", ".jpeg", ".png"}
+_SUFFIX_TUPLE = tuple(sorted(SUPPORTED_SUFFIXES))
 CLASS_TO_INDEX = {"cat": 0, "dog": 1}
+CAT_NAMES = frozenset({"cat", "cats"})
+DOG_NAMES = frozenset({"dog", "dogs"})
+# Greedy prefix so the match is the last cat/cats/dog/dogs path segment.
+_LABEL_SEGMENT_RE = re.compile(r"^(?:.*[\\/])?(cat|dog)s?(?:[\\/]|$)", re.IGNORECASE)
+
+
+def preprocess_image_uint8(
+    image: Image.Image, size: tuple[int, int] = DEFAULT_IMAGE_SIZE
+) -> np.ndarray:
+    """Convert to RGB and resize, keeping the raw uint8 pixel values.
+
+    Color histograms do not depend on resample quality, so JPEGs are decoded at a
+    reduced DCT scale when possible and resized with nearest-neighbour sampling.
+    ``Image.draft`` does that in place: a JPEG that has not been loaded yet is left
+    downscaled (smaller ``size``, possibly another ``mode``) after this call, so pass
+    ``image.copy()`` if the caller still needs the full-resolution image.
+    """
+    try:
+        # Hint only: JPEG decoders pick a 1/2, 1/4 or 1/8 scale >= the requested size;
+        # other formats ignore it.
+        image.draft("RGB", (size[0] * JPEG_DRAFT_SCALE, size[1] * JPEG_DRAFT_SCALE))
+    except Exception:
+        pass
 
-
-def preprocess_image(image: Image.Image, size: tuple[int, int] = DEFAULT_IMAGE_SIZE) -> np.ndarray:
-    """Convert to RGB, resize, and scale to [0, 1] float32."""
     if image.mode != "RGB":
         image = image.convert("RGB")
 
     try:
-        resample = Image.Resampling.BILINEAR
+        resample = Image.Resampling.NEAREST
     except AttributeError:
-        resample = Image.BILINEAR
+        resample = Image.NEAREST
 
     image = image.resize(size, resample=resample)
-    array = np.asarray(image, dtype=np.float32) / 255.0
+    return np.asarray(image, dtype=np.uint8)
+
+
+def _nearest_indices(src: int, dst: int) -> np.ndarray:
+    # PIL steps a double from scale / 2 by scale and truncates, so sum in the same
+    # order; (i + 0.5) * scale rounds differently at ties.
+    scale = src / dst
+    steps = np.full(dst, scale)
+    steps[0] = scale * 0.5
+    return np.add.accumulate(steps).astype(np.intp)
+
+
+def resize_nearest_uint8(array: np.ndarray, size: tuple[int, int] = DEFAULT_IMAGE_SIZE) -> np.ndarray:
+    """Nearest-neighbour resize of an (H, W, C) array, sampling the same pixels as PIL's NEAREST."""
+    width, height = size
+    src_height, src_width = array.shape[:2]
+    rows = _nearest_indices(src_height, height)
+    cols = _nearest_indices(src_width, width)
+    return array[rows[:, None], cols]
+
+
+def preprocess_image(image: Image.Image, size: tuple[int, int] = DEFAULT_IMAGE_SIZE) -> np.ndarray:
+    """Convert to RGB, resize, and scale to [0, 1] float32.
+
+    Like ``preprocess_image_uint8``, this may downscale an unloaded JPEG in place.
+    """
+    array = preprocess_image_uint8(image, size=size).astype(np.float32) / 255.0
     return array
 
 
@@ -41,24 +93,41 @@ def preprocess_path(path: Path, size: tuple[int, int] = DEFAULT_IMAGE_SIZE) -> n
 
 
 def _infer_label_from_parts(parts: Iterable[str]) -> str | None:
-    for part in reversed(list(parts)):
+    label = None
+    for part in parts:
         lower = part.lower()
-        if lower in {"cat", "cats"}:
-            return "cat"
-        if lower in {"dog", "dogs"}:
-            return "dog"
-    return None
+        if lower in CAT_NAMES:
+            label = "cat"
+        elif lower in DOG_NAMES:
+            label = "dog"
+    return label
+
+
+def _infer_label_from_path(path: str) -> str | None:
+    """Same rule as ``_infer_label_from_parts`` in one regex scan over the path string."""
+    match = _LABEL_SEGMENT_RE.match(path)
+    return match.group(1).lower() if match else None
 
 
 def _is_image_name(name: str) -> bool:
     return Path(name).suffix.lower() in SUPPORTED_SUFFIXES
 
 
+def _iter_image_paths(root: str) -> Iterable[str]:
+    """Yield image file paths under root using scandir's cached entry types."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_image_paths(entry.path)
+            elif entry.name.lower().endswith(_SUFFIX_TUPLE) and entry.is_file():
+                yield entry.path
+
+
 def _has_class_dirs(candidate: Path) -> bool:
     if not candidate.is_dir():
         return False
     names = {child.name.lower() for child in candidate.iterdir() if child.is_dir()}
-    return bool(names.intersection({"cat", "cats"})) and bool(names.intersection({"dog", "dogs"}))
+    return bool(names & CAT_NAMES) and bool(names & DOG_NAMES)
 
 
 def _find_dataset_root(raw_dir: Path) -> Path:
@@ -80,15 +149,11 @@ def _find_dataset_root(raw_dir: Path) -> Path:
 def _collect_from_directory(raw_dir: Path) -> tuple[dict[str, list[Path]], Path]:
     dataset_root = _find_dataset_root(raw_dir)
     paths_by_label: dict[str, list[Path]] = {"cat": [], "dog": []}
-    for path in dataset_root.rglob("*"):
-        if not path.is_file():
-            continue
-        if not _is_image_name(path.name):
-            continue
-        label = _infer_label_from_parts(path.parts)
+    for path in _iter_image_paths(str(dataset_root)):
+        label = _infer_label_from_path(path)
         if label is None:
             continue
-        paths_by_label[label].append(path)
+        paths_by_label[label].append(Path(path))
 
     if not any(paths_by_label.values()):
         raise FileNotFoundError(f"No images found under {dataset_root}")
@@ -134,6 +199,11 @@ def _resolve_path(path: Path, repo_root: Path) -> Path:
     return (repo_root / path).resolve()
 
 
+def _label_seed(seed: int, label: str) -> int:
+    digest = hashlib.blake2b(f"{seed}:{label}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
 def _stratified_split(
     paths_by_label: dict[str, list[Path]],
     seed: int,
@@ -142,9 +212,11 @@ def _stratified_split(
     splits: dict[str, list[tuple[Path, str]]] = {"train": [], "val": [], "test": []}
 
     for label in sorted(paths_by_label.keys()):
-        paths = sorted(paths_by_label[label], key=lambda p: p.as_posix())
-        rng = random.Random(f"{seed}:{label}")
-        rng.shuffle(paths)
+        paths = np.array(paths_by_label[label], dtype=object)
+        keys = np.array([path.as_posix() for path in paths], dtype=str)
+        paths = paths[np.argsort(keys, kind="stable")]
+        rng = np.random.default_rng(_label_seed(seed, label))
+        paths = paths[rng.permutation(len(paths))]
 
         total = len(paths)
         train_count = int(total * ratios["train"])
@@ -155,8 +227,9 @@ def _stratified_split(
         splits["val"].extend((path, label) for path in paths[train_count : train_count + val_count])
         splits["test"].extend((path, label) for path in paths[train_count + val_count :])
 
-    for split in splits:
-        splits[split] = sorted(splits[split], key=lambda item: item[0].as_posix())
+    for split, items in splits.items():
+        keys = np.array([path.as_posix() for path, _ in items], dtype=str)
+        splits[split] = [items[idx] for idx in np.argsort(keys, kind="stable")]
 
     return splits
 
@@ -217,6 +290,7 @@ def write_split_manifests(
         "class_to_index": CLASS_TO_INDEX,
         "label_inference": "Label inferred from any path segment named cat/cats or dog/dogs (case-insensitive).",
         "manifest_format": "path\\tlabel (repo-relative path)",
+        "shuffle": "per-label numpy default_rng(blake2b('<seed>:<label>')) permutation of sorted paths",
         "data_source": source,
         "raw_dir": raw_dir_abs.relative_to(repo_root).as_posix(),
         "dataset_root": dataset_root.relative_to(repo_root).as_posix(),
@@ -3,19 +3,18 @@
 from __future__ import annotations
 
 import argparse
-import pickle
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Iterable
 
-import matplotlib
 import numpy as np
 from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support
 
 from cats_dogs.data import CLASS_TO_INDEX, load_split_manifest, preprocess_path
+from cats_dogs.feature_cache import DEFAULT_FEATURE_CACHE_DIR, get_or_compute
 from cats_dogs.model import FeatureConfig, ModelBundle, featurize_image
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt  # noqa: E402
+from cats_dogs.predict import load_model_bundle
 
 
 def compute_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict[str, float]:
@@ -44,6 +43,12 @@ def plot_confusion_matrix(
     title: str,
 ) -> np.ndarray:
     """Create and save a confusion matrix plot."""
+    # Imported lazily: matplotlib is slow to import and only needed when plotting.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     cm = confusion_matrix(y_true, y_pred, labels=labels)
 
     fig, ax = plt.subplots(figsize=(4.5, 4.0))
@@ -55,14 +60,20 @@ def plot_confusion_matrix(
     ax.set_yticks(range(len(label_names)), label_names)
 
     threshold = cm.max() / 2 if cm.size else 0
-    for i in range(cm.shape[0]):
-        for j in range(cm.shape[1]):
-            color = "white" if cm[i, j] > threshold else "black"
-            ax.text(j, i, f"{cm[i, j]}", ha="center", va="center", color=color)
+    colors = np.where(cm > threshold, "white", "black")
+    texts = cm.astype(str)
+    for i, j in np.ndindex(cm.shape):
+        ax.text(j, i, texts[i, j], ha="center", va="center", color=colors[i, j])
 
     fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(output_path, dpi=160, bbox_inches="tight")
+    fig.savefig(
+        output_path,
+        dpi=100,
+        bbox_inches="tight",
+        format="png",
+        pil_kwargs={"optimize": False},
+    )
     plt.close(fig)
     return cm
 
@@ -74,17 +85,27 @@ def evaluate_from_features(
     class_names: list[str],
     output_dir: Path,
     prefix: str,
+    plot: bool = True,
 ) -> dict[str, object]:
-    """Evaluate a model using precomputed features."""
+    """Evaluate a model using precomputed features.
+
+    With ``plot=False`` the confusion matrix is computed but not drawn, and
+    ``confusion_matrix_path`` is ``None``.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
     predictions = model.predict(features)
     metrics = compute_metrics(labels, predictions)
 
+    label_ids = list(range(len(class_names)))
+    if not plot:
+        cm = confusion_matrix(labels, predictions, labels=label_ids)
+        return {"metrics": metrics, "confusion_matrix": cm, "confusion_matrix_path": None}
+
     cm_path = output_dir / f"confusion_matrix_{prefix}.png"
     cm = plot_confusion_matrix(
         labels,
         predictions,
-        labels=list(range(len(class_names))),
+        labels=label_ids,
         label_names=class_names,
         output_path=cm_path,
         title=f"Confusion Matrix ({prefix})",
@@ -93,35 +114,56 @@ def evaluate_from_features(
     return {"metrics": metrics, "confusion_matrix": cm, "confusion_matrix_path": cm_path}
 
 
+def _featurize_one(
+    task: tuple[Path, str, FeatureConfig, Path | None],
+) -> tuple[np.ndarray, int] | None:
+    path, label, feature_config, cache_dir = task
+    try:
+        # Cache I/O failures only warn inside get_or_compute, so this skips unreadable images alone.
+        if cache_dir is not None:
+            features = get_or_compute(path, feature_config, cache_dir=cache_dir)
+        else:
+            features = featurize_image(preprocess_path(path), feature_config)
+    except Exception:
+        return None
+    return features, CLASS_TO_INDEX[label]
+
+
 def _load_features_from_manifest(
     items: Iterable[tuple[Path, str]],
     feature_config: FeatureConfig,
+    workers: int | None = None,
+    cache_dir: Path | None = None,
 ) -> tuple[np.ndarray, np.ndarray, int]:
-    features: list[np.ndarray] = []
-    labels: list[int] = []
-    skipped = 0
+    tasks = [(path, label, feature_config, cache_dir) for path, label in items]
+    workers = workers or os.cpu_count() or 1
 
-    for path, label in items:
-        try:
-            array = preprocess_path(path)
-        except Exception:
-            skipped += 1
-            continue
-        features.append(featurize_image(array, feature_config))
-        labels.append(CLASS_TO_INDEX[label])
+    features = np.empty((len(tasks), 3 * feature_config.bins), dtype=np.float32)
+    labels = np.empty(len(tasks), dtype=np.int64)
+    count = 0
+    skipped = 0
 
-    if not features:
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(tasks) > 1 else None
+    try:
+        if executor is not None:
+            chunksize = max(1, len(tasks) // (workers * 8))
+            results = executor.map(_featurize_one, tasks, chunksize=chunksize)
+        else:
+            results = map(_featurize_one, tasks)
+        for result in results:
+            if result is None:
+                skipped += 1
+                continue
+            features[count], labels[count] = result
+            count += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if count == 0:
         raise ValueError("No valid samples found while building features.")
 
-    return np.stack(features), np.array(labels, dtype=np.int64), skipped
-
-
-def load_model_bundle(model_path: Path) -> ModelBundle:
-    with model_path.open("rb") as handle:
-        bundle = pickle.load(handle)
-    if not isinstance(bundle, ModelBundle):
-        raise TypeError("Loaded model is not a ModelBundle. Re-train with the Part 3 pipeline.")
-    return bundle
+    return features[:count], labels[:count], skipped
 
 
 def evaluate_from_manifest(
@@ -129,9 +171,13 @@ def evaluate_from_manifest(
     manifest_path: Path,
     output_dir: Path,
     prefix: str,
+    workers: int | None = None,
+    cache_dir: Path | None = None,
 ) -> dict[str, object]:
     items = load_split_manifest(manifest_path)
-    features, labels, skipped = _load_features_from_manifest(items, bundle.feature_config)
+    features, labels, skipped = _load_features_from_manifest(
+        items, bundle.feature_config, workers=workers, cache_dir=cache_dir
+    )
     class_names = [bundle.index_to_class[i] for i in sorted(bundle.index_to_class.keys())]
     results = evaluate_from_features(
         bundle.classifier,
@@ -155,6 +201,18 @@ def main() -> None:
     )
     parser.add_argument("--split", default="test", choices=["train", "val", "test"])
     parser.add_argument("--output-dir", default="artifacts/figures")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used for feature extraction (default: all CPUs).",
+    )
+    parser.add_argument(
+        "--feature-cache-dir",
+        default=str(DEFAULT_FEATURE_CACHE_DIR),
+        help="Directory for cached per-image features (keyed by image content).",
+    )
+    parser.add_argument("--no-feature-cache", action="store_true", help="Always recompute features.")
     args = parser.parse_args()
 
     model_path = Path(args.model_path)
@@ -162,7 +220,15 @@ def main() -> None:
     manifest_path = Path(args.splits_dir) / f"{args.split}.txt"
 
     bundle = load_model_bundle(model_path)
-    results = evaluate_from_manifest(bundle, manifest_path, output_dir, prefix=args.split)
+    cache_dir = None if args.no_feature_cache else Path(args.feature_cache_dir)
+    results = evaluate_from_manifest(
+        bundle,
+        manifest_path,
+        output_dir,
+        prefix=args.split,
+        workers=args.workers,
+        cache_dir=cache_dir,
+    )
     metrics = results["metrics"]
 
     print("==> Evaluation complete")
@@ -0,0 +1,86 @@
+"""On-disk cache of per-image feature vectors keyed by image content."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from cats_dogs.data import DEFAULT_IMAGE_SIZE, preprocess_image_uint8
+from cats_dogs.model import FeatureConfig, featurize_image
+
+# Bump when preprocessing or featurization changes so stale entries are not reused.
+FEATURE_CACHE_VERSION = 2
+DEFAULT_FEATURE_CACHE_DIR = Path("artifacts/cache/features")
+# Cache directories that failed a write in this process; later writes to them are skipped.
+_UNWRITABLE_DIRS: set[Path] = set()
+
+
+def cache_key(payload: bytes, config: FeatureConfig, image_size: tuple[int, int]) -> str:
+    """Hash the image bytes together with everything that affects the features."""
+    digest = hashlib.blake2b(payload, digest_size=16)
+    digest.update(f"v{FEATURE_CACHE_VERSION}:{config.bins}:{image_size[0]}x{image_size[1]}".encode())
+    return digest.hexdigest()
+
+
+def load_cached(
+    payload: bytes,
+    config: FeatureConfig,
+    cache_dir: Path = DEFAULT_FEATURE_CACHE_DIR,
+    image_size: tuple[int, int] = DEFAULT_IMAGE_SIZE,
+) -> np.ndarray | None:
+    """Return the cached feature vector for the image bytes, or ``None`` on a miss."""
+    try:
+        return np.load(cache_dir / f"{cache_key(payload, config, image_size)}.npy")
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached(
+    payload: bytes,
+    features: np.ndarray,
+    config: FeatureConfig,
+    cache_dir: Path = DEFAULT_FEATURE_CACHE_DIR,
+    image_size: tuple[int, int] = DEFAULT_IMAGE_SIZE,
+) -> None:
+    """Store a feature vector; the cache is best-effort, so write failures only warn."""
+    if cache_dir in _UNWRITABLE_DIRS:
+        return
+    entry = cache_dir / f"{cache_key(payload, config, image_size)}.npy"
+    # Write-then-rename so concurrent workers never observe a partial file.
+    tmp_path = entry.with_name(f"{entry.stem}.{os.getpid()}.tmp.npy")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        np.save(tmp_path, features)
+        os.replace(tmp_path, entry)
+    except OSError as exc:
+        _UNWRITABLE_DIRS.add(cache_dir)
+        warnings.warn(
+            f"Feature cache disabled, {cache_dir} is not writable: {exc}", RuntimeWarning, stacklevel=2
+        )
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+
+
+def get_or_compute(
+    path: Path,
+    config: FeatureConfig,
+    cache_dir: Path = DEFAULT_FEATURE_CACHE_DIR,
+    image_size: tuple[int, int] = DEFAULT_IMAGE_SIZE,
+) -> np.ndarray:
+    """Return the feature vector for an image file, computing and storing it on a miss."""
+    payload = Path(path).read_bytes()
+    features = load_cached(payload, config, cache_dir=cache_dir, image_size=image_size)
+    if features is not None:
+        return features
+
+    with Image.open(io.BytesIO(payload)) as image:
+        features = featurize_image(preprocess_image_uint8(image, size=image_size), config)
+    store_cached(payload, features, config, cache_dir=cache_dir, image_size=image_size)
+    return features
@@ -7,6 +7,8 @@ from typing import Any
 
 import numpy as np
 
+from cats_dogs import _kernels
+
 DEFAULT_FEATURE_BINS = 8
 
 
@@ -14,6 +16,10 @@ DEFAULT_FEATURE_BINS = 8
 class FeatureConfig:
     bins: int = DEFAULT_FEATURE_BINS
 
+    @property
+    def feature_dim(self) -> int:
+        return 3 * self.bins
+
 
 @dataclass(frozen=True)
 class PreprocessConfig:
@@ -38,23 +44,98 @@ class ModelBundle:
     schema_version: int = 1
 
 
+def _normalized_channel_bincount(indices: np.ndarray, bins: int) -> np.ndarray:
+    indices += np.arange(3, dtype=indices.dtype) * bins
+    hist = np.bincount(indices.ravel(), minlength=3 * bins).astype(np.float32).reshape(3, bins)
+    hist /= hist.sum(axis=1, keepdims=True).clip(min=1)
+    return hist.ravel()
+
+
 def extract_color_histogram(image_array: np.ndarray, bins: int = DEFAULT_FEATURE_BINS) -> np.ndarray:
-    """Compute normalized per-channel color histograms as features."""
+    """Compute normalized per-channel color histograms as features.
+
+    Expects values in [0, 1]. All three channels are binned in one ``np.bincount``
+    pass by offsetting each channel's bin indices into its own range. The input is
+    made C-contiguous and indices are built as ``np.intp`` so ``bincount`` can use
+    them without an internal cast/copy.
+    """
     if image_array.ndim != 3 or image_array.shape[-1] != 3:
         raise ValueError(f"Expected image array shape (H, W, 3), got {image_array.shape}")
 
-    features: list[np.ndarray] = []
-    for channel in range(3):
-        hist, _ = np.histogram(image_array[:, :, channel], bins=bins, range=(0.0, 1.0))
-        hist = hist.astype(np.float32)
-        total = hist.sum()
-        if total > 0:
-            hist /= total
-        features.append(hist)
+    image_array = np.ascontiguousarray(image_array)
+    indices = np.clip((image_array * bins).astype(np.intp), 0, bins - 1)
+    return _normalized_channel_bincount(indices, bins)
 
-    return np.concatenate(features, axis=0)
+
+def extract_color_histogram_uint8(
+    image_array: np.ndarray, bins: int = DEFAULT_FEATURE_BINS
+) -> np.ndarray:
+    """Compute the same histogram as ``extract_color_histogram`` from raw uint8 pixels.
+
+    ``floor(v * bins / 255)`` (capped at ``bins - 1``) reproduces the float binning of
+    ``v / 255``; for power-of-two bin counts it reduces to ``v >> (8 - log2(bins))``.
+    Same contiguity/``np.intp`` handling as ``extract_color_histogram``.
+    """
+    if image_array.ndim != 3 or image_array.shape[-1] != 3:
+        raise ValueError(f"Expected image array shape (H, W, 3), got {image_array.shape}")
+    if image_array.dtype != np.uint8:
+        raise ValueError(f"Expected uint8 image array, got {image_array.dtype}")
+
+    image_array = np.ascontiguousarray(image_array)
+    if 0 < bins <= 256 and bins & (bins - 1) == 0:
+        shift = 8 - (bins.bit_length() - 1)
+        indices = (image_array >> shift).astype(np.intp)
+    else:
+        indices = np.minimum(image_array.astype(np.intp) * bins // 255, bins - 1)
+    return _normalized_channel_bincount(indices, bins)
+
+
+def featurize_image_uint8(image_array: np.ndarray, config: FeatureConfig) -> np.ndarray:
+    """Convert a resized uint8 RGB array into a feature vector without float scaling.
+
+    Uses the fused Numba kernel when Numba is installed and the input is an (H, W, 3)
+    uint8 array (made C-contiguous first); otherwise falls back to the NumPy bincount path.
+    """
+    if (
+        _kernels.NUMBA_AVAILABLE
+        and image_array.dtype == np.uint8
+        and image_array.ndim == 3
+        and image_array.shape[-1] == 3
+    ):
+        return _kernels.color_histogram_uint8(np.ascontiguousarray(image_array), config.bins)
+    return extract_color_histogram_uint8(image_array, bins=config.bins)
+
+
+def featurize_batch_uint8(
+    images: np.ndarray,
+    config: FeatureConfig,
+    out: np.ndarray | None = None,
+    threads: int | None = None,
+) -> np.ndarray:
+    """Featurize an (N, H, W, 3) uint8 batch into ``out`` (allocated when omitted).
+
+    With Numba installed this is a single parallel kernel launch over the batch, run on
+    up to ``threads`` threads; otherwise each image goes through the NumPy path.
+    """
+    if images.ndim != 4 or images.shape[-1] != 3 or images.dtype != np.uint8:
+        raise ValueError(f"Expected uint8 batch of shape (N, H, W, 3), got {images.dtype} {images.shape}")
+    if out is None:
+        out = np.empty((len(images), config.feature_dim), dtype=np.float32)
+    if _kernels.NUMBA_AVAILABLE:
+        _kernels.color_histogram_batch_uint8(np.ascontiguousarray(images), out, config.bins, threads)
+    else:
+        for idx, image in enumerate(images):
+            out[idx] = extract_color_histogram_uint8(image, bins=config.bins)
+    return out
+
+
+def warmup_featurizer(config: FeatureConfig) -> None:
+    """Compile any JIT kernels used by ``featurize_image`` ahead of the first request."""
+    _kernels.warmup(config.bins)
 
 
 def featurize_image(image_array: np.ndarray, config: FeatureConfig) -> np.ndarray:
     """Convert a preprocessed image array into a feature vector."""
+    if image_array.dtype == np.uint8:
+        return featurize_image_uint8(image_array, config)
     return extract_color_histogram(image_array, bins=config.bins)
@@ -5,14 +5,30 @@ from __future__ import annotations
 import io
 import pickle
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
+import joblib
 import numpy as np
 from PIL import Image
+from sklearn.linear_model import LogisticRegression, RidgeClassifier, SGDClassifier
+from sklearn.svm import LinearSVC
 
-from cats_dogs.data import preprocess_image
-from cats_dogs.model import ModelBundle, PreprocessConfig, featurize_image
+from cats_dogs.data import JPEG_DRAFT_SCALE, preprocess_image, preprocess_image_uint8, resize_nearest_uint8
+from cats_dogs.model import ModelBundle, PreprocessConfig, featurize_image, featurize_image_uint8
+
+try:  # Optional: PyTurboJPEG + libturbojpeg for SIMD JPEG decoding with built-in downscale.
+    from turbojpeg import TJPF_RGB, TurboJPEG
+
+    _TURBOJPEG = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _TURBOJPEG = None
+
+JPEG_MAGIC = b"\xff\xd8\xff"
+LINEAR_CLASSIFIERS = (LogisticRegression, LinearSVC, RidgeClassifier, SGDClassifier)
+# LogisticRegression.multi_class values that mean one-vs-rest for a binary problem.
+_OVR_MULTI_CLASS = frozenset({"auto", "ovr", "deprecated", "warn"})
 
 
 class ModelLoadError(RuntimeError):
@@ -26,27 +42,62 @@ class PredictionResult:
     probabilities: dict[str, float]
 
 
+def _load_bundle_file(model_path: Path) -> Any:
+    with model_path.open("rb") as handle:
+        # Only raw pickles start with PROTO; compressed joblib files start with the
+        # compressor's magic bytes and must not be memory-mapped.
+        mappable = handle.read(1) == pickle.PROTO
+    try:
+        # Memory-map array payloads so multiple API workers share them via the page cache.
+        return joblib.load(model_path, mmap_mode="r" if mappable else None)
+    except Exception:
+        with model_path.open("rb") as handle:
+            return pickle.load(handle)
+
+
 def load_model_bundle(model_path: Path) -> ModelBundle:
-    """Load a ModelBundle from disk."""
+    """Load a ModelBundle from disk (joblib, memory-mapped when uncompressed, or plain pickle)."""
     if not model_path.exists():
         raise ModelLoadError(f"Model not found at {model_path}")
-    with model_path.open("rb") as handle:
-        bundle = pickle.load(handle)
+    bundle = _load_bundle_file(model_path)
     if not isinstance(bundle, ModelBundle):
         raise ModelLoadError("Loaded object is not a ModelBundle. Re-train with Part 3 pipeline.")
+    _prepare_bundle(bundle)
     return bundle
 
 
+def _prepare_bundle(bundle: ModelBundle) -> None:
+    """Precompute per-bundle constants so the request path does not redo them."""
+    classifier = bundle.classifier
+    bundle._cached_labels = _resolve_class_labels(bundle, classifier, len(bundle.index_to_class))
+    bundle._preprocess_fn = _select_preprocess_fn(bundle.preprocess_config)
+    bundle._linear_params = None
+    if isinstance(classifier, LINEAR_CLASSIFIERS) and _proba_follows_scores(classifier):
+        # decision_function is x @ W.T + b; keep float32 copies to bypass sklearn dispatch.
+        bundle._linear_params = (
+            np.ascontiguousarray(classifier.coef_, dtype=np.float32),
+            np.asarray(classifier.intercept_, dtype=np.float32),
+        )
+
+
 def _preprocess_for_inference(image: Image.Image, config: PreprocessConfig) -> np.ndarray:
-    array = preprocess_image(image, size=config.image_size)
-    if not config.normalize:
-        array = array * 255.0
+    """Preprocess for bundles trained on unnormalized (0-255) pixels."""
+    array = preprocess_image(image, size=config.image_size) * 255.0
     dtype = np.dtype(config.dtype)
     if array.dtype != dtype:
         array = array.astype(dtype)
     return array
 
 
+def _select_preprocess_fn(config: PreprocessConfig) -> Callable[[Image.Image], np.ndarray]:
+    """Resolve the preprocessing branch for a config once instead of per request."""
+    if config.normalize:
+        # The histogram featurizer bins uint8 pixels identically to their [0, 1]
+        # floats, so skip the float32 conversion and /255 on the serving path.
+        return partial(preprocess_image_uint8, size=config.image_size)
+    return partial(_preprocess_for_inference, config=config)
+
+
 def _scores_to_proba(scores: np.ndarray) -> np.ndarray:
     if scores.ndim == 1:
         scores = scores.reshape(-1, 1)
@@ -60,9 +111,24 @@ def _scores_to_proba(scores: np.ndarray) -> np.ndarray:
     return probs
 
 
-def _predict_proba(classifier: Any, features: np.ndarray) -> np.ndarray:
-    features = features.reshape(1, -1)
-    if hasattr(classifier, "predict_proba"):
+def _linear_scores(
+    linear_params: tuple[np.ndarray, np.ndarray], features: np.ndarray
+) -> np.ndarray:
+    weights, intercept = linear_params
+    scores = features.astype(np.float32, copy=False) @ weights.T + intercept
+    return scores[:, 0] if scores.shape[1] == 1 else scores
+
+
+def _predict_proba(
+    classifier: Any,
+    features: np.ndarray,
+    linear_params: tuple[np.ndarray, np.ndarray] | None = None,
+) -> np.ndarray:
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    if linear_params is not None:
+        proba = _scores_to_proba(_linear_scores(linear_params, features))
+    elif hasattr(classifier, "predict_proba"):
         proba = classifier.predict_proba(features)
     elif hasattr(classifier, "decision_function"):
         scores = classifier.decision_function(features)
@@ -77,6 +143,55 @@ def _predict_proba(classifier: Any, features: np.ndarray) -> np.ndarray:
     return np.asarray(proba, dtype=np.float32)
 
 
+def _proba_follows_scores(classifier: Any) -> bool:
+    """True when predict_proba is (or would be) a sigmoid/softmax of decision_function."""
+    if not hasattr(classifier, "decision_function"):
+        return False
+    if not hasattr(classifier, "predict_proba"):
+        return True
+    n_classes = len(getattr(classifier, "classes_", ()))
+    if isinstance(classifier, SGDClassifier):
+        return n_classes == 2 and classifier.loss == "log_loss"
+    if n_classes != 2 or not isinstance(classifier, LogisticRegression):
+        return False
+    # Binary one-vs-rest is sigmoid(d); an explicit multinomial fit is softmax([-d, d]),
+    # i.e. sigmoid(2d), so it keeps going through predict_proba.
+    return getattr(classifier, "multi_class", "auto") in _OVR_MULTI_CLASS
+
+
+def _predict_top1(
+    classifier: Any,
+    features: np.ndarray,
+    linear_params: tuple[np.ndarray, np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the best class index and its probability per row.
+
+    When probabilities are a monotone transform of the decision scores, argmax is taken
+    on the raw scores and only the winning class's probability is computed.
+    """
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    rows = np.arange(features.shape[0])
+    if linear_params is not None or _proba_follows_scores(classifier):
+        if linear_params is not None:
+            scores = _linear_scores(linear_params, features)
+        else:
+            scores = np.asarray(classifier.decision_function(features))
+        if scores.ndim == 1 or scores.shape[1] == 1:
+            scores = scores.reshape(-1)
+            best = (scores > 0).astype(np.intp)
+            probability = 1.0 / (1.0 + np.exp(-np.abs(scores)))
+        else:
+            best = np.argmax(scores, axis=1)
+            shifted = scores - scores[rows, best][:, None]
+            probability = 1.0 / np.exp(shifted).sum(axis=1)
+        return best, np.asarray(probability, dtype=np.float32)
+
+    proba = _predict_proba(classifier, features)
+    best = np.argmax(proba, axis=1)
+    return best, proba[rows, best]
+
+
 def _resolve_class_labels(bundle: ModelBundle, classifier: Any, n_classes: int) -> list[str]:
     class_indices = getattr(classifier, "classes_", None)
     if class_indices is None:
@@ -93,30 +208,96 @@ def _resolve_class_labels(bundle: ModelBundle, classifier: Any, n_classes: int)
     return labels
 
 
-def predict_image(bundle: ModelBundle, image: Image.Image) -> PredictionResult:
-    """Run inference on a PIL image and return the predicted label/probability."""
-    array = _preprocess_for_inference(image, bundle.preprocess_config)
-    features = featurize_image(array, bundle.feature_config)
-    proba = _predict_proba(bundle.classifier, features)
+def _featurize(bundle: ModelBundle, image: Image.Image) -> np.ndarray:
+    preprocess_fn = getattr(bundle, "_preprocess_fn", None)
+    if preprocess_fn is None:
+        preprocess_fn = _select_preprocess_fn(bundle.preprocess_config)
+    array = preprocess_fn(image)
+    return featurize_image(array, bundle.feature_config)
+
+
+def _bundle_labels(bundle: ModelBundle, n_classes: int) -> list[str]:
+    labels = getattr(bundle, "_cached_labels", None)
+    if labels is None or len(labels) != n_classes:
+        labels = _resolve_class_labels(bundle, bundle.classifier, n_classes)
+    return labels
+
+
+def classify_batch(bundle: ModelBundle, features: np.ndarray) -> list[PredictionResult]:
+    """Classify a stacked (N, D) feature matrix with a single classifier call."""
+    proba = _predict_proba(
+        bundle.classifier, features, getattr(bundle, "_linear_params", None)
+    )
     if proba.ndim == 1:
         proba = proba.reshape(1, -1)
-    scores = proba[0]
-    labels = _resolve_class_labels(bundle, bundle.classifier, len(scores))
-    probabilities = {label: float(score) for label, score in zip(labels, scores)}
-    best_idx = int(np.argmax(scores))
-    return PredictionResult(
-        label=labels[best_idx],
-        probability=float(scores[best_idx]),
-        probabilities=probabilities,
+    labels = _bundle_labels(bundle, proba.shape[1])
+    results: list[PredictionResult] = []
+    for scores in proba:
+        best_idx = int(np.argmax(scores))
+        results.append(
+            PredictionResult(
+                label=labels[best_idx],
+                probability=float(scores[best_idx]),
+                probabilities={label: float(score) for label, score in zip(labels, scores)},
+            )
+        )
+    return results
+
+
+def classify_batch_top1(bundle: ModelBundle, features: np.ndarray) -> list[tuple[str, float]]:
+    """Classify a stacked (N, D) feature matrix, returning only (label, probability) per row."""
+    best, probability = _predict_top1(
+        bundle.classifier, features, getattr(bundle, "_linear_params", None)
     )
+    n_classes = len(getattr(bundle.classifier, "classes_", bundle.index_to_class))
+    labels = _bundle_labels(bundle, n_classes)
+    return [(labels[idx], float(prob)) for idx, prob in zip(best, probability)]
 
 
-def predict_bytes(bundle: ModelBundle, payload: bytes) -> PredictionResult:
-    """Run inference on raw image bytes."""
+def predict_image(bundle: ModelBundle, image: Image.Image) -> PredictionResult:
+    """Run inference on a PIL image and return the predicted label/probability.
+
+    An unloaded JPEG is drafted to a reduced decode scale in place (see
+    ``preprocess_image_uint8``); pass ``image.copy()`` to keep the original intact.
+    """
+    features = _featurize(bundle, image)
+    return classify_batch(bundle, features.reshape(1, -1))[0]
+
+
+def _decode_jpeg_turbo(payload: bytes, size: tuple[int, int]) -> np.ndarray | None:
+    """Decode a JPEG at the smallest libjpeg-turbo scale >= the draft size, or None on failure."""
+    try:
+        width, height = _TURBOJPEG.decode_header(payload)[:2]
+        # Same scale choice as Image.draft in preprocess_image_uint8: the largest 1/d
+        # that does not drop below JPEG_DRAFT_SCALE times the target size.
+        scale = min(width // (size[0] * JPEG_DRAFT_SCALE), height // (size[1] * JPEG_DRAFT_SCALE))
+        scaling_factor = next(
+            ((1, d) for d in (8, 4, 2) if scale >= d and (1, d) in _TURBOJPEG.scaling_factors),
+            (1, 1),
+        )
+        array = _TURBOJPEG.decode(payload, pixel_format=TJPF_RGB, scaling_factor=scaling_factor)
+    except Exception:
+        return None
+    return resize_nearest_uint8(array, size)
+
+
+def featurize_bytes(bundle: ModelBundle, payload: bytes) -> np.ndarray:
+    """Decode raw image bytes into the feature vector expected by the classifier."""
     if not payload:
         raise ValueError("Empty image payload.")
+    config = bundle.preprocess_config
+    if _TURBOJPEG is not None and config.normalize and payload[:3] == JPEG_MAGIC:
+        array = _decode_jpeg_turbo(payload, config.image_size)
+        if array is not None:
+            return featurize_image_uint8(array, bundle.feature_config)
     with Image.open(io.BytesIO(payload)) as image:
-        return predict_image(bundle, image)
+        return _featurize(bundle, image)
+
+
+def predict_bytes(bundle: ModelBundle, payload: bytes) -> PredictionResult:
+    """Run inference on raw image bytes."""
+    features = featurize_bytes(bundle, payload)
+    return classify_batch(bundle, features.reshape(1, -1))[0]
 
 
 def predict_path(bundle: ModelBundle, path: Path) -> PredictionResult:
@@ -3,32 +3,82 @@
 from __future__ import annotations
 
 import argparse
+import gc
+import hashlib
 import json
+import multiprocessing
 import os
-import pickle
 import random
 import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import repeat
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, TypeVar
 
-import matplotlib
+import cv2
+import joblib
 import numpy as np
-from PIL import Image, ImageEnhance
-from sklearn.linear_model import SGDClassifier
+from PIL import Image
+from sklearn.linear_model import LogisticRegression, RidgeClassifier, SGDClassifier
 from sklearn.metrics import accuracy_score
 
-from cats_dogs.data import CLASS_TO_INDEX, DEFAULT_IMAGE_SIZE, load_split_manifest, preprocess_image
+from cats_dogs.data import (
+    CLASS_TO_INDEX,
+    DEFAULT_IMAGE_SIZE,
+    JPEG_DRAFT_SCALE,
+    load_split_manifest,
+    preprocess_image_uint8,
+)
 from cats_dogs.evaluate import evaluate_from_features
-from cats_dogs.model import FeatureConfig, ModelBundle, PreprocessConfig, featurize_image
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt  # noqa: E402
+from cats_dogs.model import FeatureConfig, ModelBundle, PreprocessConfig, featurize_batch_uint8
 
 
 DEFAULT_EXPERIMENT_NAME = "cats-dogs-baseline"
 DEFAULT_EPOCHS = 8
-DEFAULT_BATCH_SIZE = 256
+# 0 fits each epoch on the whole (shuffled) training matrix in one partial_fit call.
+DEFAULT_BATCH_SIZE = 0
 DEFAULT_AUGMENTATIONS_PER_IMAGE = 1
+# Classifier recorded as "model_type" for each --solver choice.
+SOLVER_MODEL_TYPES = {
+    "sgd": "SGDClassifier(log_loss)",
+    "lbfgs": "LogisticRegression(lbfgs)",
+    "ridge": "RidgeClassifier",
+}
+
+# Nearest-neighbour sampling keeps training pixels distributed like the PIL NEAREST
+# resize used at inference; INTER_AREA would smooth the color histograms.
+_CV2_INTERPOLATION = getattr(cv2, "INTER_NEAREST_EXACT", cv2.INTER_NEAREST)
+# libjpeg can scale by 1/2, 1/4 or 1/8 during the IDCT; OpenCV exposes that as
+# reduced-read flags, chosen with the same rule as preprocess_image_uint8's draft.
+_CV2_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# Decode-ahead window for the loader threads, and the largest run of images per task.
+_PREFETCH_THREADS = 8
+_PREFETCH_DEPTH = 64
+_MAX_CHUNK_ITEMS = 512
+# Images (originals plus augmentations) featurized per kernel launch: 64 x 224x224x3 ~ 9.6 MB.
+_FEATURIZE_BATCH_IMAGES = 64
+
+# Histogram features are proportions in [0, 1], so half precision is plenty for
+# storage; rows are cast back to float32 just before they reach scikit-learn. With
+# --batch-size > 0 only one batch is held in float32; full-matrix fits (the default,
+# and the lbfgs/ridge solvers) need one float32 copy, so there the saving is disk and
+# the page cache rather than peak training memory.
+FEATURE_MATRIX_DTYPE = np.float16
+# Rows per block when gathering shuffled float16 rows into a float32 buffer.
+_GATHER_BLOCK_ROWS = 4096
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Bump when decoding, augmentation or featurization changes so cached matrices are rebuilt.
+FEATURE_MATRIX_CACHE_VERSION = 8
 
 
 def _resolve_repo_root() -> Path:
@@ -42,18 +92,180 @@ def _read_metadata(splits_dir: Path) -> dict[str, object]:
     return json.loads(metadata_path.read_text(encoding="utf-8"))
 
 
-def _augment_image(image: Image.Image, rng: random.Random) -> Image.Image:
-    if rng.random() < 0.5:
-        image = image.transpose(Image.FLIP_LEFT_RIGHT)
+def _augment_image(
+    image: np.ndarray, draws: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Flip, rotate and adjust brightness/contrast of a uint8 RGB array with OpenCV.
+
+    ``draws`` holds four uniforms in [0, 1) for the flip, angle, brightness and
+    contrast. ``image`` is never modified; the result is written into ``out`` when
+    given so callers can reuse one buffer across augmentations.
+    """
+    flip_u, angle_u, brightness_u, contrast_u = (float(value) for value in draws)
+    flip = flip_u < 0.5
+
+    # Same semantics as PIL's rotate(): counter-clockwise about the centre, nearest
+    # sampling and black corners. The horizontal flip is folded into the same affine
+    # map so the image is resampled once.
+    angle = -15 + 30 * angle_u
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D(((width - 1) / 2, (height - 1) / 2), angle, 1.0)
+    if flip:
+        matrix[:, 2] += matrix[:, 0] * (width - 1)
+        matrix[:, 0] *= -1
+    out = cv2.warpAffine(
+        image, matrix, (width, height), dst=out, flags=cv2.INTER_NEAREST, borderMode=cv2.BORDER_CONSTANT
+    )
+
+    # ImageEnhance.Brightness scales towards black and ImageEnhance.Contrast blends
+    # towards the mean "L" level of the brightened image, both with PIL's truncation.
+    brightness = 0.85 + 0.3 * brightness_u
+    contrast = 0.85 + 0.3 * contrast_u
+    levels = np.arange(256, dtype=np.float32)
+    out = cv2.LUT(out, np.clip(levels * brightness, 0, 255).astype(np.uint8), dst=out)
+    grey_mean = int(cv2.mean(cv2.cvtColor(out, cv2.COLOR_RGB2GRAY))[0] + 0.5)
+    lut = np.clip(grey_mean + contrast * (levels - np.float32(grey_mean)), 0, 255).astype(np.uint8)
+    return cv2.LUT(out, lut, dst=out)
+
+
+def _imread_flag(path: Path, size: tuple[int, int]) -> int:
+    """Pick the largest JPEG decode reduction that keeps the image >= the draft size."""
+    try:
+        # Only the header is parsed here; the pixels are decoded by OpenCV below.
+        with Image.open(path) as header:
+            if header.format != "JPEG":
+                return cv2.IMREAD_COLOR
+            width, height = header.size
+    except Exception:
+        return cv2.IMREAD_COLOR
+    min_width, min_height = size[0] * JPEG_DRAFT_SCALE, size[1] * JPEG_DRAFT_SCALE
+    for factor, flag in _CV2_REDUCED_FLAGS:
+        if width // factor >= min_width and height // factor >= min_height:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def _load_rgb_fast(path: Path, size: tuple[int, int] = DEFAULT_IMAGE_SIZE) -> np.ndarray:
+    """Decode and resize an image to a uint8 RGB array with OpenCV, falling back to PIL."""
+    # Pillow ignores EXIF orientation on the serving path, so OpenCV must too.
+    image = cv2.imread(str(path), _imread_flag(path, size) | cv2.IMREAD_IGNORE_ORIENTATION)
+    if image is None:
+        # Formats OpenCV cannot read (e.g. GIF) still go through Pillow.
+        with Image.open(path) as pil_image:
+            return preprocess_image_uint8(pil_image, size=size)
+    image = cv2.resize(image, size, interpolation=_CV2_INTERPOLATION)
+    # Swap channels in place rather than allocating another image-sized buffer.
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+
+
+def _prefetch(load: Callable[[T], R], args: Iterable[T], threads: int, depth: int) -> Iterator[Future[R]]:
+    """Run ``load`` on a thread pool ``depth`` items ahead and yield futures in order."""
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pending: deque[Future[R]] = deque()
+        for arg in args:
+            pending.append(executor.submit(load, arg))
+            if len(pending) >= depth:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def _rows_per_item(augment: bool, augmentations_per_image: int, include_original: bool) -> int:
+    """Feature rows produced per image; the original is always kept when nothing is augmented."""
+    augmented = augmentations_per_image if augment else 0
+    return augmented + (1 if include_original or augmented == 0 else 0)
+
+
+def _stage_augmented(
+    base_array: np.ndarray,
+    out: np.ndarray,
+    draws: np.ndarray | None,
+    include_original: bool,
+) -> None:
+    """Fill ``out`` with one decoded image (if kept) followed by its augmented copies.
+
+    ``draws`` has one row of uniforms per augmented copy, or is ``None`` for none.
+    """
+    augmented = 0 if draws is None else len(draws)
+    first = 0
+    if include_original or augmented == 0:
+        out[0] = base_array
+        first = 1
+    for aug_idx in range(augmented):
+        _augment_image(base_array, draws[aug_idx], out=out[first + aug_idx])
+
+
+def _featurize_chunk(
+    paths: list[Path],
+    label_ids: np.ndarray,
+    aug_draws: np.ndarray | None,
+    include_original: bool,
+    feature_config: FeatureConfig,
+    prefetch_threads: int,
+    kernel_threads: int,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Featurize a contiguous run of items; returns (features, labels, skipped).
+
+    ``aug_draws`` is the chunk's slice of the (items, augmentations, 4) table of
+    augmentation uniforms, or ``None`` when the split is not augmented.
+
+    Decoding is prefetched on threads (OpenCV releases the GIL) so disk reads and
+    JPEG decodes overlap with the rest of the work. Decoded and augmented images are
+    staged in a uint8 batch buffer that is featurized with one kernel call per batch.
+    """
+    augmentations_per_image = 0 if aug_draws is None else aug_draws.shape[1]
+    rows_per_item = _rows_per_item(aug_draws is not None, augmentations_per_image, include_original)
+    features = np.empty((len(paths) * rows_per_item, feature_config.feature_dim), dtype=np.float32)
+    label_rows = np.empty(len(features), dtype=np.int64)
+    # Every decoded image has the training size; an item's rows never straddle batches.
+    capacity = max(_FEATURIZE_BATCH_IMAGES, rows_per_item)
+    batch = np.empty((capacity, DEFAULT_IMAGE_SIZE[1], DEFAULT_IMAGE_SIZE[0], 3), dtype=np.uint8)
+    row = 0
+    staged = 0
+    skipped = 0
+
+    def flush() -> None:
+        nonlocal row, staged
+        featurize_batch_uint8(
+            batch[:staged], feature_config, out=features[row : row + staged], threads=kernel_threads
+        )
+        row += staged
+        staged = 0
+
+    loaded = _prefetch(_load_rgb_fast, paths, threads=prefetch_threads, depth=_PREFETCH_DEPTH)
+    for offset, (future, label_id) in enumerate(zip(loaded, label_ids)):
+        if staged + rows_per_item > capacity:
+            flush()
+        try:
+            _stage_augmented(
+                future.result(),
+                batch[staged : staged + rows_per_item],
+                None if aug_draws is None else aug_draws[offset],
+                include_original,
+            )
+        except Exception:
+            skipped += 1
+            continue
+        label_rows[row + staged : row + staged + rows_per_item] = label_id
+        staged += rows_per_item
+    if staged:
+        flush()
+    return features[:row], label_rows[:row], skipped
+
 
-    angle = rng.uniform(-15, 15)
-    image = image.rotate(angle)
+def _worker_context() -> multiprocessing.context.BaseContext:
+    """Start method for featurization workers.
 
-    brightness = rng.uniform(0.85, 1.15)
-    contrast = rng.uniform(0.85, 1.15)
-    image = ImageEnhance.Brightness(image).enhance(brightness)
-    image = ImageEnhance.Contrast(image).enhance(contrast)
-    return image
+    Forking a process that has run a parallel Numba kernel can deadlock its threading
+    layer at exit, so workers come from a clean forkserver (or spawn) process instead.
+    The forkserver imports this module once so workers start without re-importing
+    OpenCV, scikit-learn and friends.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["cats_dogs.train"])
+    return context
 
 
 def _build_features(
@@ -62,37 +274,220 @@ def _build_features(
     augment: bool,
     augmentations_per_image: int,
     seed: int,
+    workers: int | None = None,
+    out_path: Path | None = None,
+    include_original: bool = True,
 ) -> tuple[np.ndarray, np.ndarray, int]:
-    features: list[np.ndarray] = []
-    labels: list[int] = []
+    """Write features into a preallocated matrix, memory-mapped at ``out_path`` if given."""
+    workers = workers or os.cpu_count() or 1
+    paths = [path for path, _ in items]
+    # Map labels to class ids once so workers receive int64 slices, not strings.
+    label_ids = np.fromiter((CLASS_TO_INDEX[label] for _, label in items), dtype=np.int64, count=len(items))
+    chunk_items = max(1, min(_MAX_CHUNK_ITEMS, -(-len(items) // (4 * workers))))
+    starts = range(0, len(items), chunk_items)
+    if augment and augmentations_per_image > 0:
+        # Draw every augmentation's parameters up front in one vectorized call; rows
+        # are indexed by item, so results do not depend on the chunking or pool size.
+        draw_shape = (len(items), augmentations_per_image, 4)
+        aug_draws = np.random.default_rng(seed).random(draw_shape, dtype=np.float32)
+        chunk_draws = [aug_draws[start : start + chunk_items] for start in starts]
+    else:
+        chunk_draws = [None] * len(starts)
+    args = (
+        [paths[start : start + chunk_items] for start in starts],
+        [label_ids[start : start + chunk_items] for start in starts],
+        chunk_draws,
+        repeat(include_original),
+        repeat(feature_config),
+        # Processes already overlap each other's I/O and share the cores, so each gets
+        # proportionally fewer loader and kernel threads.
+        repeat(max(1, _PREFETCH_THREADS // workers)),
+        repeat(max(1, (os.cpu_count() or 1) // workers)),
+    )
+
+    rows_per_item = _rows_per_item(augment, augmentations_per_image, include_original)
+    shape = (len(items) * rows_per_item, feature_config.feature_dim)
+    if out_path is not None:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        features = np.lib.format.open_memmap(out_path, mode="w+", dtype=FEATURE_MATRIX_DTYPE, shape=shape)
+    else:
+        features = np.empty(shape, dtype=FEATURE_MATRIX_DTYPE)
+    labels = np.empty(shape[0], dtype=np.int64)
+
+    # Compile the batch kernel once here so workers load it from Numba's on-disk cache.
+    featurize_batch_uint8(np.zeros((1, 1, 1, 3), dtype=np.uint8), feature_config, threads=1)
+    executor = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context())
+        if workers > 1 and len(starts) > 1
+        else None
+    )
+    row = 0
     skipped = 0
+    try:
+        if executor is not None:
+            results = executor.map(_featurize_chunk, *args)
+        else:
+            results = map(_featurize_chunk, *args)
+        for chunk_features, chunk_labels, chunk_skipped in results:
+            count = len(chunk_labels)
+            features[row : row + count] = chunk_features
+            labels[row : row + count] = chunk_labels
+            row += count
+            skipped += chunk_skipped
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if skipped == len(items):
+        raise ValueError("No valid samples available after preprocessing.")
 
-    for idx, (path, label) in enumerate(items):
-        try:
-            with Image.open(path) as image:
-                image = image.convert("RGB")
-                base_array = preprocess_image(image)
-                features.append(featurize_image(base_array, feature_config))
-                labels.append(CLASS_TO_INDEX[label])
-
-                if augment:
-                    for aug_idx in range(augmentations_per_image):
-                        aug_seed = seed + idx * 1000 + aug_idx
-                        rng = random.Random(aug_seed)
-                        aug_image = _augment_image(image.copy(), rng)
-                        aug_array = preprocess_image(aug_image)
-                        features.append(featurize_image(aug_array, feature_config))
-                        labels.append(CLASS_TO_INDEX[label])
-        except Exception:
-            skipped += 1
+    if isinstance(features, np.memmap):
+        features.flush()
+    # Skipped images leave unused rows at the end; slicing keeps this a view.
+    return features[:row], labels[:row], skipped
 
-    if not features:
-        raise ValueError("No valid samples available after preprocessing.")
 
-    return np.stack(features), np.array(labels, dtype=np.int64), skipped
+def _feature_cache_path(
+    cache_dir: Path,
+    splits_dir: Path,
+    split_name: str,
+    feature_config: FeatureConfig,
+    augment: bool,
+    augmentations_per_image: int,
+    seed: int,
+    include_original: bool = True,
+) -> Path:
+    """Cache entry stem for a split, keyed by its manifest and every feature setting."""
+    digest = hashlib.blake2b((splits_dir / f"{split_name}.txt").read_bytes(), digest_size=8)
+    key = {
+        "version": FEATURE_MATRIX_CACHE_VERSION,
+        "bins": feature_config.bins,
+        "image_size": list(DEFAULT_IMAGE_SIZE),
+        # The seed only influences augmented rows.
+        "augmentations": augmentations_per_image if augment else 0,
+        "seed": seed if augment else None,
+        "rows_per_item": _rows_per_item(augment, augmentations_per_image, include_original),
+    }
+    digest.update(json.dumps(key, sort_keys=True).encode("utf-8"))
+    return cache_dir / f"{split_name}-{digest.hexdigest()}"
+
+
+def _load_or_build_features(
+    cache_path: Path,
+    items: list[tuple[Path, str]],
+    refresh: bool = False,
+    **build_kwargs: object,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """Memory-map a cached feature matrix, or build it in place and record it."""
+    features_path = cache_path.with_name(f"{cache_path.name}.features.npy")
+    labels_path = cache_path.with_name(f"{cache_path.name}.labels.npy")
+    meta_path = cache_path.with_name(f"{cache_path.name}.json")
+
+    if not refresh and meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        features = np.load(features_path, mmap_mode="r")[: meta["rows"]]
+        return features, np.load(labels_path), int(meta["skipped"])
+
+    # The metadata file marks a complete entry, so drop it before rewriting the arrays.
+    meta_path.unlink(missing_ok=True)
+    features, labels, skipped = _build_features(items, out_path=features_path, **build_kwargs)
+    np.save(labels_path, labels)
+    meta_path.write_text(json.dumps({"rows": len(labels), "skipped": skipped}), encoding="utf-8")
+    return features, labels, skipped
+
+
+def _gather_rows(source: np.ndarray, rows: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Copy ``source[rows]`` into ``out``, casting a block at a time.
+
+    Gathering in blocks keeps the fancy-indexing temporary small instead of building a
+    full-size copy in the source dtype first.
+    """
+    for start in range(0, len(rows), _GATHER_BLOCK_ROWS):
+        block = rows[start : start + _GATHER_BLOCK_ROWS]
+        out[start : start + len(block)] = source[block]
+    return out
+
+
+def _sgd_epochs(
+    clf: SGDClassifier,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    epochs: int,
+    batch_size: int,
+    rng: np.random.Generator,
+) -> Iterator[tuple[int, float, float]]:
+    """Train ``clf`` with partial_fit, yielding (epoch, train_accuracy, val_accuracy).
+
+    ``X_train`` stays in FEATURE_MATRIX_DTYPE. Each mini-batch is gathered in shuffled
+    order into one reused, batch-sized float32 buffer, so SGD's Cython loop gets a
+    contiguous array without a converting copy and training holds only one batch in
+    float32. ``batch_size <= 0`` fits each epoch on the full matrix in one call, which
+    needs a full float32 buffer.
+    """
+    classes = np.array(sorted(CLASS_TO_INDEX.values()))
+    if batch_size <= 0:
+        batch_size = len(y_train)
+    progressive = batch_size < len(y_train)
+    X_buffer = np.empty((min(batch_size, len(y_train)), X_train.shape[1]), dtype=np.float32)
+
+    first_fit = True
+    for epoch in range(1, epochs + 1):
+        perm = rng.permutation(len(y_train))
+        # Mini-batches are scored just before fitting on them (progressive accuracy);
+        # full-matrix epochs are scored once after the fit.
+        correct = 0
+        scored = 0
+        for start in range(0, len(y_train), batch_size):
+            rows = perm[start : start + batch_size]
+            X_batch = _gather_rows(X_train, rows, X_buffer[: len(rows)])
+            y_batch = y_train[rows]
+            if first_fit:
+                clf.partial_fit(X_batch, y_batch, classes=classes)
+                first_fit = False
+            else:
+                if progressive:
+                    correct += int(np.count_nonzero(clf.predict(X_batch) == y_batch))
+                    scored += len(y_batch)
+                clf.partial_fit(X_batch, y_batch)
+            if not progressive:
+                correct += int(np.count_nonzero(clf.predict(X_batch) == y_batch))
+                scored += len(y_batch)
+
+        val_acc = float(accuracy_score(y_val, clf.predict(X_val)))
+        yield epoch, correct / scored, val_acc
+
+
+def _fit_full_batch(
+    clf: LogisticRegression | RidgeClassifier,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+) -> Iterator[tuple[int, float, float]]:
+    """Fit a full-batch solver in one call; yields a single (1, train_accuracy, val_accuracy)."""
+    X_fit = X_train.astype(np.float32)
+    clf.fit(X_fit, y_train)
+    train_acc = float(accuracy_score(y_train, clf.predict(X_fit)))
+    yield 1, train_acc, float(accuracy_score(y_val, clf.predict(X_val)))
+
+
+def _make_classifier(solver: str, seed: int) -> SGDClassifier | LogisticRegression | RidgeClassifier:
+    if solver == "lbfgs":
+        return LogisticRegression(C=1.0, solver="lbfgs", max_iter=200)
+    if solver == "ridge":
+        return RidgeClassifier()
+    return SGDClassifier(loss="log_loss", max_iter=1, tol=None, random_state=seed)
 
 
 def _plot_training_curve(history: dict[str, list[float]], output_path: Path) -> None:
+    # Imported lazily so --no-plot runs never pay for loading matplotlib.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     epochs = history["epoch"]
@@ -107,6 +502,17 @@ def _plot_training_curve(history: dict[str, list[float]], output_path: Path) ->
     plt.close(fig)
 
 
+def _model_compression(level: int) -> int | tuple[str, int]:
+    """joblib ``compress`` value: 0 keeps arrays memory-mappable, else lz4 (zlib without lz4)."""
+    if level <= 0:
+        return 0
+    try:
+        import lz4  # noqa: F401
+    except ImportError:
+        return ("zlib", level)
+    return ("lz4", level)
+
+
 def _resolve_build_info() -> dict[str, str]:
     for key in ("GIT_SHA", "GITHUB_SHA"):
         if os.environ.get(key):
@@ -121,14 +527,56 @@ def main() -> None:
     parser.add_argument("--splits-dir", default="data/splits")
     parser.add_argument("--artifacts-dir", default="artifacts")
     parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
-    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--solver",
+        choices=sorted(SOLVER_MODEL_TYPES),
+        default="sgd",
+        help="sgd trains for --epochs with partial_fit; lbfgs (logistic regression) and "
+        "ridge fit the full training matrix in one call.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Mini-batch size for partial_fit (default: 0, one call per epoch on the full matrix).",
+    )
     parser.add_argument("--bins", type=int, default=FeatureConfig().bins)
     parser.add_argument("--augmentations", type=int, default=DEFAULT_AUGMENTATIONS_PER_IMAGE)
+    parser.add_argument(
+        "--include-original",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Keep un-augmented training images alongside their augmented copies "
+        "(--no-include-original trains on augmented copies only).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used for feature extraction (default: all CPUs).",
+    )
+    parser.add_argument(
+        "--no-feature-cache",
+        action="store_true",
+        help="Recompute feature matrices instead of reusing <artifacts-dir>/cache.",
+    )
+    parser.add_argument(
+        "--model-compress",
+        type=int,
+        default=0,
+        help="joblib compression level for model.pkl (lz4 if installed, else zlib). "
+        "0 keeps it uncompressed so inference can memory-map it.",
+    )
     parser.add_argument("--seed", type=int, default=1337)
     parser.add_argument("--experiment", default=DEFAULT_EXPERIMENT_NAME)
     parser.add_argument("--mlflow-uri", default=None)
     parser.add_argument("--run-name", default=None)
     parser.add_argument("--device", default="cpu", choices=["cpu", "mps", "cuda"])
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="Skip the training curve and confusion matrix PNGs (history.json is still written).",
+    )
     parser.add_argument("--verbose", action="store_true", help="Print per-epoch metrics and progress.")
     args = parser.parse_args()
 
@@ -139,6 +587,7 @@ def main() -> None:
     splits_dir = (repo_root / args.splits_dir).resolve()
     artifacts_dir = (repo_root / args.artifacts_dir).resolve()
     figures_dir = artifacts_dir / "figures"
+    cache_dir = artifacts_dir / "cache"
     model_dir = artifacts_dir / "model"
     model_dir.mkdir(parents=True, exist_ok=True)
     figures_dir.mkdir(parents=True, exist_ok=True)
@@ -158,27 +607,35 @@ def main() -> None:
     val_items = load_split_manifest(splits_dir / "val.txt")
     test_items = load_split_manifest(splits_dir / "test.txt")
 
-    X_train, y_train, skipped_train = _build_features(
-        train_items,
-        feature_config=feature_config,
-        augment=True,
-        augmentations_per_image=args.augmentations,
-        seed=args.seed,
-    )
-    X_val, y_val, skipped_val = _build_features(
-        val_items,
-        feature_config=feature_config,
-        augment=False,
-        augmentations_per_image=0,
-        seed=args.seed,
-    )
-    X_test, y_test, skipped_test = _build_features(
-        test_items,
-        feature_config=feature_config,
-        augment=False,
-        augmentations_per_image=0,
-        seed=args.seed,
-    )
+    def _split_features(
+        split_name: str, items: list[tuple[Path, str]], augment: bool
+    ) -> tuple[np.ndarray, np.ndarray, int]:
+        augmentations_per_image = args.augmentations if augment else 0
+        cache_path = _feature_cache_path(
+            cache_dir,
+            splits_dir,
+            split_name,
+            feature_config,
+            augment,
+            augmentations_per_image,
+            args.seed,
+            include_original=args.include_original,
+        )
+        return _load_or_build_features(
+            cache_path,
+            items,
+            refresh=args.no_feature_cache,
+            feature_config=feature_config,
+            augment=augment,
+            augmentations_per_image=augmentations_per_image,
+            seed=args.seed,
+            workers=args.workers,
+            include_original=args.include_original,
+        )
+
+    X_train, y_train, skipped_train = _split_features("train", train_items, augment=True)
+    X_val, y_val, skipped_val = _split_features("val", val_items, augment=False)
+    X_test, y_test, skipped_test = _split_features("test", test_items, augment=False)
     if args.verbose:
         print(
             "==> Feature matrices ready: "
@@ -214,10 +671,13 @@ def main() -> None:
                 "seed": args.seed,
                 "epochs": args.epochs,
                 "batch_size": args.batch_size,
+                "model_compress": args.model_compress,
                 "feature_bins": args.bins,
                 "augmentations_per_image": args.augmentations,
+                "include_original": args.include_original,
                 "image_size": f"{DEFAULT_IMAGE_SIZE[0]}x{DEFAULT_IMAGE_SIZE[1]}",
-                "model_type": "SGDClassifier(log_loss)",
+                "model_type": SOLVER_MODEL_TYPES[args.solver],
+                "solver": args.solver,
                 "device": args.device,
                 "train_samples": int(len(y_train)),
                 "val_samples": int(len(y_val)),
@@ -234,25 +694,24 @@ def main() -> None:
             }
         )
 
-        clf = SGDClassifier(loss="log_loss", max_iter=1, tol=None, random_state=args.seed)
-        classes = np.array(sorted(CLASS_TO_INDEX.values()))
+        clf = _make_classifier(args.solver, args.seed)
         rng = np.random.default_rng(args.seed)
 
-        history = {"epoch": [], "train_accuracy": [], "val_accuracy": []}
-        first_fit = True
-        for epoch in range(1, args.epochs + 1):
-            indices = rng.permutation(len(y_train))
-            for start in range(0, len(y_train), args.batch_size):
-                batch_idx = indices[start : start + args.batch_size]
-                if first_fit:
-                    clf.partial_fit(X_train[batch_idx], y_train[batch_idx], classes=classes)
-                    first_fit = False
-                else:
-                    clf.partial_fit(X_train[batch_idx], y_train[batch_idx])
-
-            train_acc = float(accuracy_score(y_train, clf.predict(X_train)))
-            val_acc = float(accuracy_score(y_val, clf.predict(X_val)))
+        # The small evaluation splits are cast once; X_train is cast per epoch below.
+        X_val = X_val.astype(np.float32)
+        X_test = X_test.astype(np.float32)
 
+        history = {"epoch": [], "train_accuracy": [], "val_accuracy": []}
+        if args.solver == "sgd":
+            total_epochs = args.epochs
+            epoch_stats = _sgd_epochs(
+                clf, X_train, y_train, X_val, y_val, epochs=args.epochs, batch_size=args.batch_size, rng=rng
+            )
+        else:
+            # Closed-form / full-batch solvers are scored once after their single fit.
+            total_epochs = 1
+            epoch_stats = _fit_full_batch(clf, X_train, y_train, X_val, y_val)
+        for epoch, train_acc, val_acc in epoch_stats:
             history["epoch"].append(epoch)
             history["train_accuracy"].append(train_acc)
             history["val_accuracy"].append(val_acc)
@@ -261,14 +720,24 @@ def main() -> None:
             mlflow.log_metric("val_accuracy", val_acc, step=epoch)
             if args.verbose:
                 print(
-                    f"Epoch {epoch}/{args.epochs} "
+                    f"Epoch {epoch}/{total_epochs} "
                     f"train_acc={train_acc:.4f} val_acc={val_acc:.4f}",
                     flush=True,
                 )
 
-        curve_path = figures_dir / "training_curve.png"
-        _plot_training_curve(history, curve_path)
-        mlflow.log_artifact(str(curve_path))
+        # The classifier keeps no reference to the training data, and the exhausted epoch
+        # generator has dropped its buffers; release the matrix (or its memmap) too so
+        # evaluation runs at a lower peak RSS.
+        del epoch_stats, X_train, y_train
+        gc.collect()
+
+        history_path = figures_dir / "history.json"
+        history_path.write_text(json.dumps(history, indent=2), encoding="utf-8")
+        mlflow.log_artifact(str(history_path))
+        if not args.no_plot:
+            curve_path = figures_dir / "training_curve.png"
+            _plot_training_curve(history, curve_path)
+            mlflow.log_artifact(str(curve_path))
 
         class_names = [name for name, _ in sorted(CLASS_TO_INDEX.items(), key=lambda item: item[1])]
         val_results = evaluate_from_features(
@@ -278,6 +747,7 @@ def main() -> None:
             class_names=class_names,
             output_dir=figures_dir,
             prefix="val",
+            plot=not args.no_plot,
         )
         test_results = evaluate_from_features(
             clf,
@@ -286,6 +756,7 @@ def main() -> None:
             class_names=class_names,
             output_dir=figures_dir,
             prefix="test",
+            plot=not args.no_plot,
         )
 
         val_metrics = val_results["metrics"]
@@ -304,8 +775,9 @@ def main() -> None:
             }
         )
 
-        mlflow.log_artifact(str(val_results["confusion_matrix_path"]))
-        mlflow.log_artifact(str(test_results["confusion_matrix_path"]))
+        for results in (val_results, test_results):
+            if results["confusion_matrix_path"] is not None:
+                mlflow.log_artifact(str(results["confusion_matrix_path"]))
 
         metrics_summary = {
             "val": val_metrics,
@@ -338,9 +810,11 @@ def main() -> None:
             preprocess_config=preprocess_config,
             training_config={
                 "seed": args.seed,
+                "solver": args.solver,
                 "epochs": args.epochs,
                 "batch_size": args.batch_size,
                 "augmentations_per_image": args.augmentations,
+                "include_original": args.include_original,
                 "feature_bins": args.bins,
                 "device": args.device,
             },
@@ -352,8 +826,8 @@ def main() -> None:
         )
 
         model_path = model_dir / "model.pkl"
-        with model_path.open("wb") as handle:
-            pickle.dump(bundle, handle)
+        # Uncompressed by default so predict/evaluate can memory-map the arrays.
+        joblib.dump(bundle, model_path, compress=_model_compression(args.model_compress))
         mlflow.log_artifact(str(model_path))
 
     print("==> Training complete")
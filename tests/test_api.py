@@ -0,0 +1,142 @@
+"""Tests for the FastAPI service."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+from pathlib import Path
+import pickle
+import sys
+
+import numpy as np
+from fastapi.testclient import TestClient
+from PIL import Image
+from sklearn.linear_model import SGDClassifier
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT))
+
+import app.main as main  # noqa: E402
+from cats_dogs.model import FeatureConfig, ModelBundle, PreprocessConfig  # noqa: E402
+from cats_dogs.predict import featurize_bytes, load_model_bundle, predict_bytes  # noqa: E402
+
+
+def _make_payloads(count: int) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    payloads = []
+    for _ in range(count):
+        # Noise around a random base color, so each image has its own histogram.
+        pixels = rng.integers(0, 256, size=3) + rng.integers(-60, 60, size=(48, 64, 3))
+        buffer = io.BytesIO()
+        Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buffer, format="JPEG")
+        payloads.append(buffer.getvalue())
+    return payloads
+
+
+def _write_bundle(path: Path, payloads: list[bytes]) -> None:
+    bundle = ModelBundle(
+        classifier=None,
+        class_to_index={"cat": 0, "dog": 1},
+        index_to_class={0: "cat", 1: "dog"},
+        feature_config=FeatureConfig(bins=8),
+        preprocess_config=PreprocessConfig(image_size=(224, 224), normalize=True, dtype="float32"),
+        training_config={},
+        metrics={},
+        created_at="2024-01-01T00:00:00Z",
+        mlflow_run_id=None,
+        versions={},
+        build_info={},
+    )
+    # Fit on the payloads themselves so labels and probabilities differ per image.
+    features = np.stack([featurize_bytes(bundle, payload) for payload in payloads])
+    targets = (features[:, :4].sum(axis=1) > features[:, 4:8].sum(axis=1)).astype(np.int64)
+    targets[:2] = [0, 1]
+    bundle.classifier = SGDClassifier(loss="log_loss", random_state=0).fit(features, targets)
+    with path.open("wb") as handle:
+        pickle.dump(bundle, handle)
+
+
+def test_concurrent_predict_requests_each_get_their_own_result(tmp_path: Path, monkeypatch) -> None:
+    payloads = _make_payloads(24)
+    model_path = tmp_path / "model.pkl"
+    _write_bundle(model_path, payloads)
+    monkeypatch.setattr(main, "MODEL_PATH", model_path)
+    # A longer window makes the concurrent requests share classifier calls.
+    monkeypatch.setattr(main, "MAX_DELAY_MS", 50.0)
+    bundle = load_model_bundle(model_path)
+    expected = [predict_bytes(bundle, payload) for payload in payloads]
+
+    with TestClient(main.app) as client:
+
+        def post(payload: bytes):
+            return client.post("/predict", files={"file": ("image.jpg", payload, "image/jpeg")})
+
+        with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+            responses = list(executor.map(post, payloads))
+
+    assert [response.status_code for response in responses] == [200] * len(payloads)
+    for response, result in zip(responses, expected):
+        body = response.json()
+        assert body["label"] == result.label
+        assert abs(body["probability"] - result.probability) < 1e-5
+
+
+def test_batch_worker_skips_cancelled_futures_and_fails_every_waiter(monkeypatch) -> None:
+    batch_sizes = []
+
+    def fake_classify(bundle, features: np.ndarray) -> list[tuple[str, float]]:
+        batch_sizes.append(len(features))
+        if (features < 0).any():
+            raise RuntimeError("classifier failed")
+        return [("cat", float(row[0])) for row in features]
+
+    monkeypatch.setattr(main, "classify_batch_top1", fake_classify)
+    monkeypatch.setattr(main, "MAX_DELAY_MS", 20.0)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        worker = asyncio.create_task(main._run_batch_worker(queue))
+        try:
+            waiting = [loop.create_future() for _ in range(3)]
+            waiting[1].cancel()
+            for value, future in zip((1.0, 2.0, 3.0), waiting):
+                queue.put_nowait((np.array([value], dtype=np.float32), future))
+            results = await asyncio.gather(waiting[0], waiting[2])
+
+            failing = [loop.create_future() for _ in range(2)]
+            for future in failing:
+                queue.put_nowait((np.array([-1.0], dtype=np.float32), future))
+            errors = await asyncio.gather(*failing, return_exceptions=True)
+        finally:
+            worker.cancel()
+        return results, errors
+
+    results, errors = asyncio.run(scenario())
+
+    assert results == [("cat", 1.0), ("cat", 3.0)]
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    # The cancelled request never reached the classifier.
+    assert batch_sizes == [2, 2]
+
+
+def test_predict_rejects_oversized_and_empty_uploads(tmp_path: Path, monkeypatch) -> None:
+    payloads = _make_payloads(4)
+    model_path = tmp_path / "model.pkl"
+    _write_bundle(model_path, payloads)
+    monkeypatch.setattr(main, "MODEL_PATH", model_path)
+    monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", len(payloads[0]) - 1)
+
+    with TestClient(main.app) as client:
+
+        def post(payload: bytes):
+            return client.post("/predict", files={"file": ("image.jpg", payload, "image/jpeg")})
+
+        oversized = post(payloads[0])
+        empty = post(b"")
+        monkeypatch.setattr(main, "MAX_UPLOAD_BYTES", len(payloads[0]))
+        at_limit = post(payloads[0])
+
+    assert oversized.status_code == 413
+    assert empty.status_code == 400
+    assert at_limit.status_code == 200
@@ -0,0 +1,48 @@
+"""Unit tests for the on-disk feature cache."""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+from PIL import Image
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from cats_dogs.data import preprocess_path  # noqa: E402
+from cats_dogs.evaluate import _load_features_from_manifest  # noqa: E402
+from cats_dogs.feature_cache import get_or_compute  # noqa: E402
+from cats_dogs.model import FeatureConfig, featurize_image  # noqa: E402
+
+
+def test_get_or_compute_matches_direct_features_and_reuses_entry(tmp_path: Path) -> None:
+    image_path = tmp_path / "cat.png"
+    rng = np.random.default_rng(0)
+    Image.fromarray(rng.integers(0, 256, size=(64, 80, 3), dtype=np.uint8)).save(image_path)
+    cache_dir = tmp_path / "cache"
+    config = FeatureConfig(bins=8)
+
+    first = get_or_compute(image_path, config, cache_dir=cache_dir)
+    entries = list(cache_dir.glob("*.npy"))
+    second = get_or_compute(image_path, config, cache_dir=cache_dir)
+
+    assert len(entries) == 1
+    assert np.array_equal(first, featurize_image(preprocess_path(image_path), config))
+    assert np.array_equal(first, second)
+
+
+def test_evaluation_features_survive_an_unwritable_cache_dir(tmp_path: Path) -> None:
+    image_path = tmp_path / "dog.png"
+    Image.new("RGB", (48, 40), color=(10, 200, 30)).save(image_path)
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    config = FeatureConfig(bins=8)
+
+    with pytest.warns(RuntimeWarning, match="Feature cache disabled"):
+        features, labels, skipped = _load_features_from_manifest(
+            [(image_path, "dog"), (image_path, "dog")], config, workers=1, cache_dir=blocker / "cache"
+        )
+
+    assert skipped == 0
+    assert labels.tolist() == [1, 1]
+    assert np.array_equal(features[0], featurize_image(preprocess_path(image_path), config))
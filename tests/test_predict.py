@@ -1,15 +1,28 @@
 """Unit tests for inference utilities."""
 
+import io
 from pathlib import Path
+import pickle
 import sys
 
+import joblib
 import numpy as np
 from PIL import Image
+import pytest
+from sklearn.linear_model import LogisticRegression, RidgeClassifier, SGDClassifier
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from cats_dogs.model import FeatureConfig, ModelBundle, PreprocessConfig  # noqa: E402
-from cats_dogs.predict import predict_image  # noqa: E402
+from cats_dogs.data import preprocess_image_uint8  # noqa: E402
+from cats_dogs.model import FeatureConfig, ModelBundle, PreprocessConfig, featurize_image  # noqa: E402
+from cats_dogs import predict  # noqa: E402
+from cats_dogs.predict import (  # noqa: E402
+    classify_batch,
+    classify_batch_top1,
+    featurize_bytes,
+    load_model_bundle,
+    predict_image,
+)
 
 
 class DummyClassifier:
@@ -21,9 +34,9 @@ class DummyClassifier:
         return np.repeat(self._probs, X.shape[0], axis=0)
 
 
-def test_predict_image_returns_label_and_probability() -> None:
-    bundle = ModelBundle(
-        classifier=DummyClassifier([0.2, 0.8], classes=[0, 1]),
+def _make_bundle(classifier) -> ModelBundle:
+    return ModelBundle(
+        classifier=classifier,
         class_to_index={"cat": 0, "dog": 1},
         index_to_class={0: "cat", 1: "dog"},
         feature_config=FeatureConfig(bins=8),
@@ -36,8 +49,142 @@ def test_predict_image_returns_label_and_probability() -> None:
         build_info={},
     )
 
+
+def test_predict_image_returns_label_and_probability() -> None:
+    bundle = _make_bundle(DummyClassifier([0.2, 0.8], classes=[0, 1]))
+
     image = Image.new("RGB", (128, 128), color=(255, 0, 0))
     result = predict_image(bundle, image)
 
     assert result.label == "dog"
     assert abs(result.probability - 0.8) < 1e-6
+
+
+def test_classify_batch_returns_one_result_per_row() -> None:
+    bundle = _make_bundle(DummyClassifier([0.7, 0.3], classes=[0, 1]))
+    features = np.zeros((3, 24), dtype=np.float32)
+
+    results = classify_batch(bundle, features)
+
+    assert len(results) == 3
+    assert all(result.label == "cat" for result in results)
+    assert abs(results[0].probabilities["dog"] - 0.3) < 1e-6
+
+
+def _fit_binary(classifier, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    features = rng.random((64, 24), dtype=np.float32)
+    targets = (features[:, 0] > features[:, 1]).astype(np.int64)
+    return classifier.fit(features, targets), features
+
+
+@pytest.mark.filterwarnings("ignore:.*multi_class.*:FutureWarning")
+@pytest.mark.parametrize(
+    "make_classifier",
+    [
+        lambda: SGDClassifier(loss="log_loss", random_state=0),
+        lambda: LogisticRegression(),
+        # Binary multinomial probabilities are sigmoid(2d), not sigmoid(d).
+        lambda: LogisticRegression(multi_class="multinomial"),
+        # No predict_proba: probabilities are the sigmoid of decision_function.
+        lambda: RidgeClassifier(),
+    ],
+    ids=["sgd", "logistic-ovr", "logistic-multinomial", "ridge"],
+)
+def test_loaded_bundle_fast_paths_match_classifier(tmp_path: Path, make_classifier) -> None:
+    classifier, features = _fit_binary(make_classifier())
+    model_path = tmp_path / "model.pkl"
+    with model_path.open("wb") as handle:
+        pickle.dump(_make_bundle(classifier), handle)
+
+    bundle = load_model_bundle(model_path)
+    full = classify_batch(bundle, features)
+    top1 = classify_batch_top1(bundle, features)
+
+    if hasattr(classifier, "predict_proba"):
+        expected = classifier.predict_proba(features)
+    else:
+        assert bundle._linear_params is not None
+        dog = 1.0 / (1.0 + np.exp(-classifier.decision_function(features)))
+        expected = np.stack([1.0 - dog, dog], axis=1)
+    expected_labels = ["cat" if idx == 0 else "dog" for idx in classifier.predict(features)]
+    assert [label for label, _ in top1] == expected_labels
+    assert [result.label for result in full] == expected_labels
+    assert np.allclose([prob for _, prob in top1], expected.max(axis=1), atol=1e-6)
+    assert np.allclose([result.probabilities["dog"] for result in full], expected[:, 1], atol=1e-6)
+
+
+@pytest.mark.filterwarnings("ignore:.*multi_class.*:FutureWarning")
+def test_multinomial_logistic_bundle_scores_through_predict_proba(tmp_path: Path) -> None:
+    classifier, features = _fit_binary(LogisticRegression(multi_class="multinomial"), seed=1)
+    model_path = tmp_path / "model.pkl"
+    with model_path.open("wb") as handle:
+        pickle.dump(_make_bundle(classifier), handle)
+
+    bundle = load_model_bundle(model_path)
+    results = classify_batch(bundle, features)
+    image = Image.new("RGB", (96, 64), color=(200, 30, 60))
+    single = predict_image(bundle, image)
+
+    assert bundle._linear_params is None
+    expected = classifier.predict_proba(features)
+    assert np.allclose([[r.probabilities["cat"], r.probabilities["dog"]] for r in results], expected, atol=1e-6)
+    image_features = featurize_image(preprocess_image_uint8(image), bundle.feature_config)
+    assert abs(single.probability - classifier.predict_proba(image_features.reshape(1, -1)).max()) < 1e-6
+
+
+@pytest.mark.parametrize("compress", [0, 3], ids=["raw", "zlib"])
+def test_joblib_bundles_round_trip_through_load_model_bundle(tmp_path: Path, compress: int) -> None:
+    classifier, features = _fit_binary(SGDClassifier(loss="log_loss", random_state=0))
+    model_path = tmp_path / "model.pkl"
+    joblib.dump(_make_bundle(classifier), model_path, compress=compress)
+
+    bundle = load_model_bundle(model_path)
+    results = classify_batch(bundle, features)
+
+    # Only uncompressed bundles can be memory-mapped; compressed ones load into memory.
+    assert isinstance(bundle.classifier.coef_, np.memmap) == (compress == 0)
+    assert np.array_equal(bundle.classifier.coef_, classifier.coef_)
+    expected_labels = ["cat" if idx == 0 else "dog" for idx in classifier.predict(features)]
+    assert [result.label for result in results] == expected_labels
+    expected = classifier.predict_proba(features)
+    assert np.allclose([result.probabilities["dog"] for result in results], expected[:, 1], atol=1e-6)
+
+
+class StubTurboJPEG:
+    """Stand-in for turbojpeg.TurboJPEG that decodes through PIL's libjpeg scaling."""
+
+    scaling_factors = frozenset({(1, 1), (1, 2), (1, 4), (1, 8)})
+
+    def __init__(self) -> None:
+        self.scaling_factor = None
+
+    def decode_header(self, payload: bytes) -> tuple[int, int, int, int]:
+        with Image.open(io.BytesIO(payload)) as image:
+            return (*image.size, 0, 0)
+
+    def decode(self, payload: bytes, pixel_format: int, scaling_factor: tuple[int, int]) -> np.ndarray:
+        self.scaling_factor = scaling_factor
+        num, den = scaling_factor
+        with Image.open(io.BytesIO(payload)) as image:
+            width, height = image.size
+            image.draft("RGB", (-(-width * num // den), -(-height * num // den)))
+            return np.asarray(image.convert("RGB"))
+
+
+def test_featurize_bytes_turbojpeg_branch_matches_pil_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    bundle = _make_bundle(DummyClassifier([0.5, 0.5], classes=[0, 1]))
+    rng = np.random.default_rng(0)
+    buffer = io.BytesIO()
+    Image.fromarray(rng.integers(0, 256, size=(1024, 1024, 3), dtype=np.uint8)).save(buffer, format="JPEG")
+    payload = buffer.getvalue()
+    monkeypatch.setattr(predict, "_TURBOJPEG", None)
+    expected = featurize_bytes(bundle, payload)
+
+    stub = StubTurboJPEG()
+    monkeypatch.setattr(predict, "_TURBOJPEG", stub)
+    monkeypatch.setattr(predict, "TJPF_RGB", 0, raising=False)
+    features = featurize_bytes(bundle, payload)
+
+    assert stub.scaling_factor == (1, 2)
+    assert np.allclose(features, expected, atol=1e-6)
@@ -1,14 +1,23 @@
 """Unit tests for preprocessing utilities."""
 
+import os
 from pathlib import Path
+import subprocess
 import sys
 
 from PIL import Image
 import numpy as np
+import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
-from cats_dogs.data import preprocess_image  # noqa: E402
+from cats_dogs.data import preprocess_image, resize_nearest_uint8  # noqa: E402
+from cats_dogs.model import (  # noqa: E402
+    FeatureConfig,
+    extract_color_histogram,
+    extract_color_histogram_uint8,
+    featurize_batch_uint8,
+)
 
 
 def test_preprocess_image_shape_dtype_range() -> None:
@@ -19,3 +28,69 @@ def test_preprocess_image_shape_dtype_range() -> None:
     assert array.dtype == np.float32
     assert array.min() >= 0.0
     assert array.max() <= 1.0
+
+
+@pytest.mark.parametrize("source_size", [(1024, 256), (1472, 192), (224, 224), (97, 601)])
+def test_resize_nearest_uint8_matches_pil_nearest(source_size: tuple[int, int]) -> None:
+    rng = np.random.default_rng(0)
+    width, height = source_size
+    array = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+    expected = np.asarray(Image.fromarray(array).resize((224, 224), Image.NEAREST))
+
+    assert np.array_equal(resize_nearest_uint8(array, (224, 224)), expected)
+
+
+def test_color_histogram_matches_per_channel_histogram() -> None:
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 256, size=(32, 48, 3)).astype(np.float32) / 255.0
+
+    features = extract_color_histogram(array, bins=8)
+
+    expected = []
+    for channel in range(3):
+        hist, _ = np.histogram(array[:, :, channel], bins=8, range=(0.0, 1.0))
+        expected.append(hist / hist.sum())
+    assert features.shape == (24,)
+    assert np.allclose(features, np.concatenate(expected))
+
+
+def test_uint8_histogram_matches_float_histogram() -> None:
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, 256, size=(32, 48, 3)).astype(np.uint8)
+    pixels.reshape(-1)[:256] = np.arange(256)
+
+    for bins in (8, 10):
+        expected = extract_color_histogram(pixels.astype(np.float32) / 255.0, bins=bins)
+        assert np.array_equal(extract_color_histogram_uint8(pixels, bins=bins), expected)
+
+
+def test_numba_kernels_match_numpy_histogram() -> None:
+    pytest.importorskip("numba")
+    from cats_dogs import _kernels
+
+    rng = np.random.default_rng(2)
+    # A non-contiguous view exercises the contiguity guard in front of the kernels.
+    images = rng.integers(0, 256, size=(5, 40, 64, 3), dtype=np.uint8)[:, :, ::2]
+    images[:, :8] = np.arange(256, dtype=np.uint8).reshape(8, 32, 1)
+
+    for bins in (8, 10, 256):
+        expected = np.stack([extract_color_histogram_uint8(image, bins=bins) for image in images])
+        single = np.stack([_kernels.color_histogram_uint8(np.ascontiguousarray(image), bins) for image in images])
+        batch = featurize_batch_uint8(images, FeatureConfig(bins=bins), threads=2)
+        assert np.allclose(single, expected, rtol=0, atol=1e-7)
+        assert np.allclose(batch, expected, rtol=0, atol=1e-7)
+
+
+def test_importing_model_does_not_load_numba() -> None:
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    code = "import sys; import cats_dogs.model; print('numba' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(src_dir)},
+    )
+
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,49 @@
+"""Unit tests for dataset collection and split utilities."""
+
+from pathlib import Path
+import sys
+
+from PIL import Image
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from cats_dogs.data import (  # noqa: E402
+    DEFAULT_SPLIT_RATIOS,
+    _collect_from_directory,
+    _infer_label_from_path,
+    _stratified_split,
+)
+
+
+def test_infer_label_uses_last_matching_segment() -> None:
+    assert _infer_label_from_path("/data/cats/Dog/1.jpg") == "dog"
+    assert _infer_label_from_path("/data/Cats/1.jpg") == "cat"
+    assert _infer_label_from_path("/data/catsy/cat.1.jpg") is None
+
+
+def test_collect_from_directory_finds_labeled_images(tmp_path: Path) -> None:
+    for label in ("Cat", "Dog"):
+        (tmp_path / "PetImages" / label).mkdir(parents=True)
+        for idx in range(3):
+            Image.new("RGB", (8, 8)).save(tmp_path / "PetImages" / label / f"{idx}.jpg")
+    (tmp_path / "PetImages" / "Cat" / "notes.txt").write_text("skip me", encoding="utf-8")
+
+    paths_by_label, dataset_root = _collect_from_directory(tmp_path)
+
+    assert dataset_root == tmp_path / "PetImages"
+    assert len(paths_by_label["cat"]) == 3
+    assert len(paths_by_label["dog"]) == 3
+
+
+def test_stratified_split_is_deterministic_and_order_independent() -> None:
+    paths_by_label = {
+        "cat": [Path(f"/data/cat/{idx}.jpg") for idx in range(50)],
+        "dog": [Path(f"/data/dog/{idx}.jpg") for idx in range(30)],
+    }
+    reversed_input = {label: paths[::-1] for label, paths in paths_by_label.items()}
+
+    splits = _stratified_split(paths_by_label, seed=1337, ratios=DEFAULT_SPLIT_RATIOS)
+
+    assert splits == _stratified_split(reversed_input, seed=1337, ratios=DEFAULT_SPLIT_RATIOS)
+    assert {name: len(items) for name, items in splits.items()} == {"train": 64, "val": 8, "test": 8}
+    assert splits["train"] == sorted(splits["train"], key=lambda item: item[0].as_posix())
@@ -0,0 +1,224 @@
+"""Unit tests for training feature extraction."""
+
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+from PIL import Image, ImageEnhance
+import pytest
+from sklearn.metrics import accuracy_score
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+import cats_dogs.train as train  # noqa: E402
+from cats_dogs.data import preprocess_image_uint8  # noqa: E402
+from cats_dogs.model import FeatureConfig, extract_color_histogram_uint8, featurize_image_uint8  # noqa: E402
+from cats_dogs.train import (  # noqa: E402
+    _augment_image,
+    _build_features,
+    _feature_cache_path,
+    _fit_full_batch,
+    _gather_rows,
+    _load_or_build_features,
+    _make_classifier,
+)
+
+
+def _pil_augment(image: np.ndarray, draws: np.ndarray) -> np.ndarray:
+    """The original PIL augmentation pipeline, driven by the same uniforms."""
+    flip_u, angle_u, brightness_u, contrast_u = (float(value) for value in draws)
+    pil_image = Image.fromarray(image)
+    if flip_u < 0.5:
+        pil_image = pil_image.transpose(Image.FLIP_LEFT_RIGHT)
+    pil_image = pil_image.rotate(-15 + 30 * angle_u)
+    pil_image = ImageEnhance.Brightness(pil_image).enhance(0.85 + 0.3 * brightness_u)
+    pil_image = ImageEnhance.Contrast(pil_image).enhance(0.85 + 0.3 * contrast_u)
+    return np.asarray(pil_image)
+
+
+def test_augment_image_matches_pil_reference_histograms() -> None:
+    rng = np.random.default_rng(0)
+    image = cv2.GaussianBlur(rng.integers(0, 256, size=(96, 128, 3), dtype=np.uint8), (9, 9), 0)
+    original = image.copy()
+    draws = np.random.default_rng(1).random((32, 4), dtype=np.float32)
+
+    for row in draws:
+        augmented = _augment_image(image, row)
+        expected = _pil_augment(image, row)
+
+        # Nearest-neighbour rotation may pick a neighbouring pixel on a handful of
+        # boundary samples; brightness/contrast must otherwise agree exactly.
+        assert (augmented != expected).any(axis=2).mean() < 0.01
+        for bins in (8, 10, 32):
+            difference = extract_color_histogram_uint8(augmented, bins) - extract_color_histogram_uint8(
+                expected, bins
+            )
+            assert np.abs(difference).max() < 2e-3
+    assert np.array_equal(image, original)
+
+
+def test_training_loader_matches_serving_preprocessing_on_large_jpeg(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    path = tmp_path / "large.jpg"
+    # Large enough that both decoders take the 1/2 DCT scale.
+    Image.fromarray(cv2.GaussianBlur(rng.integers(0, 256, size=(1000, 1200, 3), dtype=np.uint8), (15, 15), 0)).save(
+        path, quality=90
+    )
+
+    with Image.open(path) as image:
+        served = preprocess_image_uint8(image)
+    trained = train._load_rgb_fast(path)
+
+    assert trained.shape == served.shape
+    for bins in (10, 32):
+        difference = extract_color_histogram_uint8(trained, bins) - extract_color_histogram_uint8(served, bins)
+        assert np.abs(difference).sum() < 5e-3
+
+
+def test_training_loader_ignores_exif_orientation(tmp_path: Path) -> None:
+    pixels = np.zeros((200, 300, 3), dtype=np.uint8)
+    pixels[:100] = (220, 30, 30)
+    pixels[100:] = (30, 30, 220)
+    plain, rotated = tmp_path / "plain.jpg", tmp_path / "rotated.jpg"
+    Image.fromarray(pixels).save(plain, quality=95)
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise on display.
+    Image.fromarray(pixels).save(rotated, quality=95, exif=exif)
+
+    assert np.array_equal(train._load_rgb_fast(rotated), train._load_rgb_fast(plain))
+
+
+def _write_image_set(root: Path, count: int, corrupt_index: int) -> list[tuple[Path, str]]:
+    rng = np.random.default_rng(2)
+    items = []
+    for idx in range(count):
+        label = "cat" if idx % 2 == 0 else "dog"
+        path = root / label / f"{idx}.jpg"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if idx == corrupt_index:
+            path.write_bytes(b"not an image")
+        else:
+            size = (int(rng.integers(160, 320)), int(rng.integers(160, 320)))
+            Image.fromarray(rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)).save(path)
+        items.append((path, label))
+    return items
+
+
+def test_build_features_rows_are_stable_across_batches_and_workers(tmp_path: Path, monkeypatch) -> None:
+    items = _write_image_set(tmp_path, count=7, corrupt_index=3)
+    valid = [item for idx, item in enumerate(items) if idx != 3]
+    config = FeatureConfig(bins=8)
+    # Three rows per item against a capacity of four forces a flush after every item.
+    monkeypatch.setattr(train, "_FEATURIZE_BATCH_IMAGES", 4)
+
+    features, labels, skipped = _build_features(
+        items, config, augment=True, augmentations_per_image=2, seed=0, workers=1
+    )
+
+    assert skipped == 1
+    assert features.shape == (len(valid) * 3, config.feature_dim)
+    assert labels.tolist() == [0 if label == "cat" else 1 for _, label in valid for _ in range(3)]
+    originals = np.stack([featurize_image_uint8(train._load_rgb_fast(path), config) for path, _ in valid])
+    assert np.array_equal(features[0::3], originals.astype(features.dtype))
+
+    for workers in (3, 4):
+        pooled_features, pooled_labels, pooled_skipped = _build_features(
+            items, config, augment=True, augmentations_per_image=2, seed=0, workers=workers
+        )
+        assert pooled_skipped == 1
+        assert np.array_equal(pooled_features, features)
+        assert np.array_equal(pooled_labels, labels)
+
+    augmented_only, augmented_labels, _ = _build_features(
+        items, config, augment=True, augmentations_per_image=2, seed=0, workers=1, include_original=False
+    )
+    keep = np.arange(len(features)) % 3 != 0
+    assert np.array_equal(augmented_only, features[keep])
+    assert np.array_equal(augmented_labels, labels[keep])
+
+
+def test_feature_cache_path_tracks_manifest_and_settings(tmp_path: Path) -> None:
+    (tmp_path / "train.txt").write_text("a.jpg\tcat\n", encoding="utf-8")
+    config = FeatureConfig(bins=8)
+
+    def key(**overrides: object) -> Path:
+        settings = {"augment": True, "augmentations_per_image": 2, "seed": 0, "include_original": True}
+        settings.update(overrides)
+        return _feature_cache_path(tmp_path / "cache", tmp_path, "train", config, **settings)
+
+    base = key()
+    assert base == key()
+    assert base != key(seed=1)
+    assert base != key(include_original=False)
+    assert base != _feature_cache_path(tmp_path / "cache", tmp_path, "train", FeatureConfig(bins=10), True, 2, 0)
+    # Without augmentation the seed has no effect on the rows.
+    assert key(augment=False, seed=0) == key(augment=False, seed=1)
+
+    (tmp_path / "train.txt").write_text("b.jpg\tcat\n", encoding="utf-8")
+    assert base != key()
+
+
+def test_load_or_build_features_hits_misses_and_refreshes(tmp_path: Path, monkeypatch) -> None:
+    items = _write_image_set(tmp_path / "images", count=4, corrupt_index=1)
+    cache_path = tmp_path / "cache" / "train-key"
+    meta_path = cache_path.with_name("train-key.json")
+    builds = []
+
+    def counting_build(*args, **kwargs):
+        builds.append(kwargs["out_path"])
+        return _build_features(*args, **kwargs)
+
+    monkeypatch.setattr(train, "_build_features", counting_build)
+    build_kwargs = {
+        "feature_config": FeatureConfig(bins=8),
+        "augment": True,
+        "augmentations_per_image": 1,
+        "seed": 0,
+        "workers": 1,
+    }
+
+    features, labels, skipped = _load_or_build_features(cache_path, items, **build_kwargs)
+    assert len(builds) == 1 and meta_path.exists()
+    assert skipped == 1 and features.shape[0] == len(labels) == 6
+
+    cached_features, cached_labels, cached_skipped = _load_or_build_features(cache_path, items, **build_kwargs)
+    assert len(builds) == 1
+    assert isinstance(cached_features, np.memmap)
+    assert np.array_equal(cached_features, features)
+    assert np.array_equal(cached_labels, labels)
+    assert cached_skipped == skipped
+
+    _load_or_build_features(cache_path, items, refresh=True, **build_kwargs)
+    assert len(builds) == 2
+
+    # Arrays without the metadata marker are an interrupted write, not a cache hit.
+    meta_path.unlink()
+    _load_or_build_features(cache_path, items, **build_kwargs)
+    assert len(builds) == 3 and meta_path.exists()
+
+
+def test_gather_rows_casts_shuffled_rows_block_by_block(monkeypatch) -> None:
+    monkeypatch.setattr(train, "_GATHER_BLOCK_ROWS", 3)
+    source = np.random.default_rng(4).random((10, 6)).astype(np.float16)
+    rows = np.random.default_rng(5).permutation(10)[:8]
+    out = np.empty((8, 6), dtype=np.float32)
+
+    assert _gather_rows(source, rows, out) is out
+    assert np.array_equal(out, source[rows].astype(np.float32))
+
+
+@pytest.mark.parametrize("solver", ["lbfgs", "ridge"])
+def test_fit_full_batch_yields_one_history_entry(solver: str) -> None:
+    rng = np.random.default_rng(6)
+    features = rng.random((80, 12)).astype(np.float16)
+    targets = (features[:, 0] > features[:, 1]).astype(np.int64)
+    clf = _make_classifier(solver, seed=0)
+
+    history = list(_fit_full_batch(clf, features[:60], targets[:60], features[60:], targets[60:]))
+
+    assert len(history) == 1
+    epoch, train_acc, val_acc = history[0]
+    assert epoch == 1
+    assert train_acc == accuracy_score(targets[:60], clf.predict(features[:60].astype(np.float32)))
+    assert val_acc == accuracy_score(targets[60:], clf.predict(features[60:]))